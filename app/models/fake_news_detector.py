@@ -1,16 +1,173 @@
 from typing import Dict, List, Tuple
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import hashlib
 import logging
+import queue
 import re
+import threading
+import time
 
-logging.basicConfig(level=logging.INFO)
+# Pas de logging.basicConfig ici : configurer le logger racine est le rôle
+# du point d'entrée de l'application, pas d'un module importé
 logger = logging.getLogger(__name__)
 
 try:
-    from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
-    import torch
-    TRANSFORMERS_AVAILABLE = True
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
 except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
+# Patterns précompilés une seule fois à l'import du module
+# (évite de reconstruire les listes et de recompiler les regex à chaque appel)
+# Liste unique d'affirmations politiques, partagée par toutes les méthodes
+# (elle était redéfinie avec de légères variantes dans quatre endroits)
+_POLITICAL_RE = [
+    re.compile(r'\b(est|is)\s+(le|la|un|une)\s+(président|president|premier ministre|prime minister|roi|king|reine|queen)'),
+    re.compile(r'\b(est|is)\s+(le|la)\s+(présidente|presidente|presidante|president)'),  # Inclut la faute "presidante"
+    re.compile(r'\b(est|is)\s+(élu|elected|nommé|appointed)\s+(président|president)'),
+    re.compile(r'\b(est|is)\s+(le|la)\s+.*(président|president|presidante)'),  # Pattern plus flexible
+]
+
+_FAKE_PATTERNS_RE = [
+    re.compile(r'\b(est mort|is dead|décédé|passed away)\b.*(?!source|selon|according)'),
+    re.compile(r'\b(a été tué|has been killed|assassinated)\b'),
+]
+
+_PRESIDANTE_RE = re.compile(r'\bpresidante\b')
+_NUMBERS_RE = re.compile(r'\d+')
+_SIMPLE_FACTUAL_RE = re.compile(r'\b(est|is|a été|has been)\s+(le|la|un|une|argentin|français|américain|président)')
+
+_DEATH_KEYWORDS = ['est mort', 'is dead', 'décédé', 'passed away', 'a été tué', 'has been killed', 'assassiné']
+
+# Alternation unique fusionnant tous les patterns heuristiques : le texte n'est
+# parcouru qu'une seule fois au lieu d'une dizaine de re.search indépendants
+_HEURISTIC_SCAN_RE = re.compile(
+    r'(?P<political>' + '|'.join(p.pattern for p in _POLITICAL_RE) + r')'
+    r'|(?P<simple_factual>' + _SIMPLE_FACTUAL_RE.pattern + r')'
+    r'|(?P<death>' + '|'.join(_DEATH_KEYWORDS) + r')'
+    r'|(?P<presidante>\bpresidante\b)'
+    r'|(?P<numbers>\d+)'
+)
+
+
+def _scan_heuristic_flags(text_lower: str) -> Dict:
+    """Une seule passe sur le texte pour tous les indicateurs booléens."""
+    flags = {
+        "political": False,
+        "simple_factual": False,
+        "death": False,
+        "presidante": False,
+        "numbers": False,
+    }
+    for match in _HEURISTIC_SCAN_RE.finditer(text_lower):
+        flags[match.lastgroup] = True
+        if match.lastgroup == "political":
+            # Le pattern politique (greedy .*) peut englober d'autres indicateurs
+            fragment = match.group()
+            if "presidante" in fragment:
+                flags["presidante"] = True
+            if _NUMBERS_RE.search(fragment):
+                flags["numbers"] = True
+            if any(kw in fragment for kw in _DEATH_KEYWORDS):
+                flags["death"] = True
+    # L'alternation s'arrête au premier groupe qui matche : un motif politique
+    # peut masquer une correspondance factuelle simple au même endroit. On ne
+    # retente le pattern d'origine que dans ce cas rare, le coût est nul sur
+    # le chemin commun
+    if flags["political"] and not flags["simple_factual"]:
+        flags["simple_factual"] = bool(_SIMPLE_FACTUAL_RE.search(text_lower))
+    return flags
+
+
+# Listes de mots-clés par catégorie, partagées par les méthodes heuristiques
+_KEYWORD_CATEGORIES = {
+    "suspicious": [
+        'breaking', 'shocking', 'you won\'t believe', 'doctors hate',
+        'secret', 'they don\'t want you to know', 'miracle', 'guaranteed',
+        'exclusif', 'révélé', 'choc', 'incroyable', 'vous ne le croirez pas',
+        'click here', 'limited time', 'act now', 'urgent'
+    ],
+    "alarmist": [
+        'urgent', 'breaking', 'shocking', 'exposed', 'revealed',
+        'secret', 'hidden truth', 'they don\'t want you to know',
+        'exclusif', 'révélé', 'choc', 'incroyable', 'vous ne le croirez pas'
+    ],
+    "source": [
+        'source', 'according to', 'study', 'research', 'report',
+        'selon', 'étude', 'recherche', 'rapport', 'journal', 'média',
+        'bbc', 'reuters', 'ap news', 'le monde', 'france info',
+        'published', 'publié', 'confirmed', 'confirmé'
+    ],
+    "emotional": [
+        'amazing', 'incredible', 'unbelievable', 'terrifying', 'horrifying',
+        'incroyable', 'terrifiant', 'horrible', 'épouvantable'
+    ],
+}
+
+# Mots simples en frozenset (intersection d'ensembles en C) et locutions à
+# part : seul le petit résidu multi-mots garde la sémantique substring
+_WORD_RE = re.compile(r"\w+")
+_KEYWORD_WORDSETS = {
+    category: frozenset(keyword for keyword in keywords if ' ' not in keyword)
+    for category, keywords in _KEYWORD_CATEGORIES.items()
+}
+_KEYWORD_PHRASES = {
+    category: [keyword for keyword in keywords if ' ' in keyword]
+    for category, keywords in _KEYWORD_CATEGORIES.items()
+}
+
+# Automate Aho-Corasick : toutes les catégories sont cherchées en une seule
+# passe O(n) au lieu d'un balayage substring par mot-clé
+if AHOCORASICK_AVAILABLE:
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _category, _keywords in _KEYWORD_CATEGORIES.items():
+        for _keyword in _keywords:
+            # un même mot-clé peut appartenir à plusieurs catégories
+            _existing = _KEYWORD_AUTOMATON.get(_keyword, [])
+            _KEYWORD_AUTOMATON.add_word(_keyword, _existing + [(_category, _keyword)])
+    _KEYWORD_AUTOMATON.make_automaton()
+else:
+    _KEYWORD_AUTOMATON = None
+
+
+def _char_stats(text: str) -> Tuple[int, int, int, int]:
+    """Statistiques de caractères (majuscules, '!', '?', '.') en une passe."""
+    if NUMPY_AVAILABLE:
+        # Un seul histogramme bincount sur les octets remplace quatre passes :
+        # majuscules = tranche 65..90, '!' = 33, '?' = 63, '.' = 46
+        # (approximation ASCII pour les majuscules)
+        arr = np.frombuffer(text.encode('utf-8', 'ignore'), dtype=np.uint8)
+        counts = np.bincount(arr, minlength=256)
+        caps = int(counts[65:91].sum())
+        return caps, int(counts[33]), int(counts[63]), int(counts[46])
+    char_counter = Counter(text)
+    caps = sum(count for char, count in char_counter.items() if char.isupper())
+    return caps, char_counter['!'], char_counter['?'], char_counter['.']
+
+
+def _count_keywords(text_lower: str) -> Dict:
+    """Compte les mots-clés distincts présents, par catégorie, en une passe."""
+    if _KEYWORD_AUTOMATON is not None:
+        found = {category: set() for category in _KEYWORD_CATEGORIES}
+        for _, entries in _KEYWORD_AUTOMATON.iter(text_lower):
+            for category, keyword in entries:
+                found[category].add(keyword)
+        return {category: len(keywords) for category, keywords in found.items()}
+    # Fallback sans pyahocorasick : une seule tokenisation puis intersections
+    # d'ensembles, le balayage substring ne reste que pour les locutions
+    tokens = frozenset(_WORD_RE.findall(text_lower))
+    return {
+        category: len(_KEYWORD_WORDSETS[category] & tokens)
+        + sum(1 for phrase in _KEYWORD_PHRASES[category] if phrase in text_lower)
+        for category in _KEYWORD_CATEGORIES
+    }
+
+# transformers/torch sont importés paresseusement dans __init__ : leur import
+# coûte plusieurs centaines de ms même quand seul le mode heuristique est utilisé
+torch = None
 
 try:
     import numpy as np
@@ -20,37 +177,209 @@ except ImportError:
     np = None
 
 
+
+class _BatchedClassifier:
+    """
+    Regroupe les appels concurrents au classifieur en micro-lots.
+
+    Les textes reçus dans une fenêtre de 10 ms sont tokenisés ensemble
+    (padding) et passés au modèle en un seul forward : à batch=8 le débit
+    est quasiment multiplié par 8 pour un surcoût de latence marginal.
+    """
+
+    def __init__(self, detector, max_batch_size: int = 8, window_ms: float = 10.0):
+        self.detector = detector
+        self.max_batch_size = max_batch_size
+        self.window_s = window_ms / 1000.0
+        self.queue = queue.Queue()
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def classify(self, text: str) -> float:
+        future = Future()
+        self.queue.put((text, future))
+        return future.result()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.window_s
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                scores = self.detector._classify_batch([text for text, _ in batch])
+                for (_, future), score in zip(batch, scores):
+                    future.set_result(score)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+
+@dataclass
+class _TextFeatures:
+    """
+    Caractéristiques du texte calculées une seule fois par analyse.
+
+    text.lower(), text.split() et les passes de scan étaient refaits dans
+    chaque méthode ; ici ils sont partagés par tout le pipeline.
+    """
+    text: str
+    text_lower: str = field(init=False)
+    words: List[str] = field(init=False)
+    char_count: int = field(init=False)
+    scan_flags: Dict = field(init=False)
+    keyword_counts: Dict = field(init=False)
+
+    def __post_init__(self):
+        self.text_lower = self.text.lower()
+        self.words = self.text.split()
+        self.char_count = len(self.text)
+        self.scan_flags = _scan_heuristic_flags(self.text_lower)
+        self.keyword_counts = _count_keywords(self.text_lower)
+
+
+# Nombre maximal de résultats d'analyse gardés en cache par détecteur
+_RESULT_CACHE_SIZE = 4096
+
+
 class FakeNewsDetector:
     def __init__(self):
-        self.classifier = None
-        
-        if TRANSFORMERS_AVAILABLE:
+        self.model = None
+        self.tokenizer = None
+        # Cache LRU des résultats : la même affirmation revient souvent et
+        # l'analyse est pure par rapport au texte, un hit évite tout le forward
+        self._result_cache = OrderedDict()
+        # detect_fake_news tourne sur plusieurs threads (pool CPU de l'app,
+        # pool du mode batch) : le LRU se protège comme le _MemoryCache du
+        # cache partagé
+        self._result_cache_lock = threading.Lock()
+        # Le forward BERT (qui libère le GIL) et les heuristiques Python
+        # peuvent se recouvrir : le pool cache la latence des heuristiques
+        self._pool = ThreadPoolExecutor(max_workers=2)
+
+        # Import paresseux des dépendances IA : le mode heuristique pur ne
+        # paie jamais le coût de chargement de torch/transformers
+        global torch
+        try:
+            import torch as torch_module
+            from transformers import AutoTokenizer, AutoModelForSequenceClassification
+            torch = torch_module
+            transformers_available = True
+        except ImportError:
+            transformers_available = False
+
+        if transformers_available:
             try:
                 self.device = "cuda" if torch.cuda.is_available() else "cpu"
                 self.model_name = "distilbert-base-uncased-finetuned-sst-2-english"
                 
                 import os
                 os.environ['HF_HUB_DOWNLOAD_TIMEOUT'] = '120'
-                
+
+                # Hygiène de threads sur CPU : la sursouscription OMP/MKL
+                # (chaque couche qui crée cpu_count threads) peut coûter un
+                # facteur 6 ; on épingle un nombre unique partagé partout
+                num_threads = max(1, (os.cpu_count() or 2) // 2)
+                if self.device == "cpu":
+                    torch.set_num_threads(num_threads)
+                    try:
+                        torch.set_num_interop_threads(1)
+                    except RuntimeError:
+                        pass  # déjà fixé plus tôt dans le processus
+                    os.environ.setdefault('OMP_NUM_THREADS', str(num_threads))
+                    os.environ.setdefault('MKL_NUM_THREADS', str(num_threads))
+
                 logger.info(f"Chargement du modèle {self.model_name}...")
                 self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-                self.model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
-                self.classifier = pipeline(
-                    "text-classification",
-                    model=self.model,
-                    tokenizer=self.tokenizer,
-                    device=0 if self.device == "cuda" else -1
-                )
+                self.model = None
+                try:
+                    import onnxruntime
+                    from optimum.onnxruntime import ORTModelForSequenceClassification
+                    onnx_available = True
+                except ImportError:
+                    onnx_available = False
+                if onnx_available and self.device == "cpu":
+                    try:
+                        # ONNX Runtime : fusion de graphe + kernels optimisés,
+                        # 2-3x plus rapide que PyTorch FP32 sur CPU
+                        session_options = onnxruntime.SessionOptions()
+                        session_options.graph_optimization_level = (
+                            onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+                        )
+                        session_options.intra_op_num_threads = num_threads
+                        session_options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+                        self.model = ORTModelForSequenceClassification.from_pretrained(
+                            self.model_name, export=True, session_options=session_options
+                        )
+                        logger.info("Modèle exporté vers ONNX Runtime")
+                    except Exception as onnx_error:
+                        logger.warning(f"Export ONNX impossible: {onnx_error}")
+                        self.model = None
+                if self.model is None:
+                    self.model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+                    if self.device == "cpu":
+                        try:
+                            # Quantification dynamique INT8 : ~3x plus rapide sur CPU
+                            # et ~4x moins de mémoire, sans recalibration nécessaire
+                            self.model = torch.quantization.quantize_dynamic(
+                                self.model, {torch.nn.Linear}, dtype=torch.qint8
+                            )
+                            logger.info("Modèle quantifié en INT8 pour l'inférence CPU")
+                        except Exception as quant_error:
+                            logger.warning(f"Quantification INT8 impossible: {quant_error}")
+                    else:
+                        # FP16 sur GPU : l'inférence DistilBERT est limitée par la
+                        # bande passante mémoire, la demi-précision divise par deux
+                        # le trafic des poids et active les tensor cores
+                        self.model = self.model.half().to(self.device)
+                        logger.info("Modèle chargé en FP16 sur GPU")
+                if hasattr(self.model, "eval"):
+                    self.model.eval()
+                self._batcher = _BatchedClassifier(self)
                 logger.info("Modèle chargé avec succès")
             except Exception as e:
                 logger.warning(f"Erreur chargement modèle: {e}")
                 logger.info("L'application continuera en mode heuristique (sans IA)")
-                self.classifier = None
+                self.model = None
         else:
             logger.info("Transformers non disponible - mode heuristique")
+
+    def _classify(self, text: str) -> float:
+        """Soumet le texte au micro-batcher partagé et attend son score."""
+        return self._batcher.classify(text)
+
+    def _classify_batch(self, texts: List[str]) -> List[float]:
+        """
+        Appel direct tokenizer + modèle, sans le wrapper pipeline de HF
+        (détection de framework, mapping de labels, emballage en liste)
+        dont le surcoût domine à batch=1. Retourne les probabilités NEGATIVE.
+        """
+        # Troncature au niveau tokens (512 vrais tokens) plutôt qu'une coupe
+        # text[:512] en caractères qui gaspille la capacité du modèle
+        inputs = self.tokenizer(list(texts), return_tensors='pt',
+                                padding=True, truncation=True, max_length=512)
+        if self.device == "cuda":
+            inputs = {name: tensor.to(self.device) for name, tensor in inputs.items()}
+        with torch.inference_mode():
+            if self.device == "cuda":
+                with torch.autocast("cuda", dtype=torch.float16):
+                    logits = self.model(**inputs).logits
+            else:
+                logits = self.model(**inputs).logits
+            probs = torch.softmax(logits.float(), -1)
+        return [float(row[0]) for row in probs]
     
     def detect_fake_news(self, text: str) -> Dict:
-        if not text or len(text.strip()) < 10:
+        # len(text) < 10 rejette la plupart des cas sans la copie de .strip() ;
+        # le strip ne s'exécute que pour les textes longs composés d'espaces
+        if not text or len(text) < 10 or len(text.strip()) < 10:
             return {
                 "verdict": "insuffisant",
                 "confidence": 0.0,
@@ -58,74 +387,87 @@ class FakeNewsDetector:
                 "reasons": ["Texte trop court pour une analyse fiable"]
             }
         
-        # Analyse avec le modèle IA si disponible
-        ai_score = 0.5  # Score neutre par défaut
-        try:
-            if self.classifier:
-                result = self.classifier(text[:512])  # Limite à 512 tokens
-                # Adaptation du résultat pour fake news detection
-                raw_score = result[0]['score'] if isinstance(result, list) else result.get('score', 0.5)
-                label = result[0]['label'] if isinstance(result, list) else result.get('label', 'NEGATIVE')
-                # Convertir le score en probabilité de fake news
-                if label == 'NEGATIVE':
-                    ai_score = raw_score
-                else:
-                    ai_score = 1.0 - raw_score
-            else:
-                # Fallback: analyse heuristique améliorée
-                ai_score, _ = self._heuristic_analysis(text)
-        except Exception as e:
-            logger.error(f"Erreur lors de l'analyse: {e}")
-            ai_score, _ = self._heuristic_analysis(text)
-        
-        # Analyse heuristique complémentaire approfondie
-        heuristics = self._analyze_heuristics(text)
-        
-        # Calcul du score final avec pondération améliorée
-        # On combine l'IA (50%) et les heuristiques (50%) pour plus de fiabilité
-        heuristic_score = heuristics['suspicion_score']
-        final_score = (ai_score * 0.5) + (heuristic_score * 0.5)
-        
-        # Seuils plus stricts pour éviter les faux positifs
-        # Nécessite un score élevé OU plusieurs red flags pour être considéré comme fake
-        
+        cache_key = hashlib.blake2s(text.encode('utf-8'), digest_size=16).digest()
+        with self._result_cache_lock:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+                # copie superficielle : les appelants ajustent le verdict en place
+                return dict(cached)
+
+        # Caractéristiques du texte calculées une seule fois et partagées
+        # par toutes les méthodes d'analyse
+        features = _TextFeatures(text)
+
+        # Pré-vérification bon marché : si le verdict va être forcé, le
+        # forward DistilBERT serait calculé pour être aussitôt écrasé
+        political_match = features.scan_flags["political"]
+        has_typo = features.scan_flags["presidante"]
+        has_sources = features.keyword_counts["source"] > 0
+
         # Cas spéciaux : Affirmations politiques factuelles sans source = TRÈS suspect (fiabilité proche de 0%)
-        political_patterns = [
-            r'\b(est|is)\s+(le|la|un|une)\s+(président|president|premier ministre)',
-            r'\b(est|is)\s+(le|la)\s+(présidente|presidente|presidante|president)',
-        ]
-        text_lower = text.lower()
-        political_match = any(re.search(pattern, text_lower) for pattern in political_patterns)
-        has_typo = bool(re.search(r'\bpresidante\b', text_lower))
-        
         # Si affirmation politique factuelle + pas de source + court = FORCER FAKE avec fiabilité proche de 0%
-        if political_match and not heuristics['has_sources'] and len(text) < 150:
+        forced_score = None
+        if political_match and not has_sources and features.char_count < 150:
             # Forcer un score très élevé pour avoir fiabilité proche de 0%
-            final_score = 0.98  # 98% de suspicion = 2% de fiabilité (proche de 0%)
-            is_fake = True
-            verdict = "fake"
-        elif political_match and has_typo and not heuristics['has_sources']:
+            forced_score = 0.98  # 98% de suspicion = 2% de fiabilité (proche de 0%)
+        elif political_match and has_typo and not has_sources:
             # Affirmation politique + faute + pas de source = encore plus suspect
-            final_score = 0.99  # 99% de suspicion = 1% de fiabilité (presque 0%)
-            is_fake = True
-            verdict = "fake"
-        elif (final_score > 0.65) or (heuristics['red_flags'] >= 3):
+            forced_score = 0.99  # 99% de suspicion = 1% de fiabilité (presque 0%)
+
+        if forced_score is not None:
+            # Verdict déjà tranché : inutile de payer le forward du modèle
+            heuristics = self._analyze_heuristics(features)
+            ai_score = 0.5
+            final_score = forced_score
             is_fake = True
             verdict = "fake"
-        elif 0.4 <= final_score <= 0.65:
-            is_fake = False
-            verdict = "à_vérifier"
         else:
-            is_fake = False
-            verdict = "probablement_vrai"
+            # Les heuristiques Python partent dans le pool pendant que le
+            # thread appelant attend le micro-batcher : leur coût disparaît
+            # derrière la latence BERT, et comme chaque requête atteint le
+            # batcher depuis son propre thread, N appels concurrents peuvent
+            # fusionner dans la même fenêtre (via le pool à 2 workers, les
+            # batches plafonnaient à 2 quelle que soit la charge)
+            heuristics_future = self._pool.submit(self._analyze_heuristics, features)
+
+            ai_score = 0.5  # Score neutre par défaut
+            try:
+                if self.model is not None:
+                    # Probabilité NEGATIVE assimilée à une probabilité de fake news
+                    ai_score = self._classify(text)
+                else:
+                    # Fallback: analyse heuristique améliorée
+                    ai_score, _ = self._heuristic_analysis(features)
+            except Exception as e:
+                logger.error(f"Erreur lors de l'analyse: {e}")
+                ai_score, _ = self._heuristic_analysis(features)
+            heuristics = heuristics_future.result()
+
+            # Calcul du score final avec pondération améliorée
+            # On combine l'IA (50%) et les heuristiques (50%) pour plus de fiabilité
+            heuristic_score = heuristics['suspicion_score']
+            final_score = (ai_score * 0.5) + (heuristic_score * 0.5)
+
+            # Seuils plus stricts pour éviter les faux positifs
+            # Nécessite un score élevé OU plusieurs red flags pour être considéré comme fake
+            if (final_score > 0.65) or (heuristics['red_flags'] >= 3):
+                is_fake = True
+                verdict = "fake"
+            elif 0.4 <= final_score <= 0.65:
+                is_fake = False
+                verdict = "à_vérifier"
+            else:
+                is_fake = False
+                verdict = "probablement_vrai"
         
         # Génération des raisons détaillées
-        reasons = self._generate_reasons(text, final_score, heuristics, ai_score)
+        reasons = self._generate_reasons(features, final_score, heuristics, ai_score)
         
         # Calcul de la fiabilité (inverse du score de suspicion)
         reliability = (1.0 - final_score) * 100
         
-        return {
+        result = {
             "verdict": verdict,
             "confidence": float(final_score),
             "reliability": float(reliability),  # Pourcentage de fiabilité
@@ -134,38 +476,45 @@ class FakeNewsDetector:
             "heuristics": heuristics,
             "ai_score": float(ai_score)
         }
-    
-    def _heuristic_analysis(self, text: str) -> Tuple[float, str]:
-        text_lower = text.lower()
-        words = text.split()
-        
+
+        with self._result_cache_lock:
+            self._result_cache[cache_key] = dict(result)
+            if len(self._result_cache) > _RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+
+        return result
+
+    def detect_fake_news_batch(self, texts: List[str]) -> List[Dict]:
+        """
+        Analyse plusieurs textes ensemble. Les analyses partent en parallèle
+        sur un pool dédié : leurs forwards arrivent dans la même fenêtre du
+        micro-batcher et fusionnent en une seule passe modèle.
+        (Pool transitoire plutôt que self._pool : les analyses y soumettent
+        déjà leurs heuristiques, s'auto-soumettre bloquerait le pool.)
+        """
+        if not texts:
+            return []
+        if len(texts) == 1:
+            return [self.detect_fake_news(texts[0])]
+        with ThreadPoolExecutor(max_workers=min(8, len(texts))) as pool:
+            return list(pool.map(self.detect_fake_news, texts))
+
+    def _heuristic_analysis(self, features: _TextFeatures) -> Tuple[float, str]:
+        text_lower = features.text_lower
+        words = features.words
+
         # Score de base (neutre)
         score = 0.3
-        
+
         # 1. Mots-clés suspects (anglais et français)
-        suspicious_keywords = [
-            'breaking', 'shocking', 'you won\'t believe', 'doctors hate',
-            'secret', 'they don\'t want you to know', 'miracle', 'guaranteed',
-            'exclusif', 'révélé', 'choc', 'incroyable', 'vous ne le croirez pas',
-            'click here', 'limited time', 'act now', 'urgent'
-        ]
-        suspicion_count = sum(1 for keyword in suspicious_keywords if keyword in text_lower)
+        suspicion_count = features.keyword_counts["suspicious"]
         score += min(suspicion_count * 0.1, 0.3)
-        
-        fake_patterns = [
-            r'\b(est mort|is dead|décédé|passed away)\b.*(?!source|selon|according)',
-            r'\b(a été tué|has been killed|assassinated)\b',
-        ]
-        pattern_matches = sum(1 for pattern in fake_patterns if re.search(pattern, text_lower))
+
+        pattern_matches = sum(1 for pattern in _FAKE_PATTERNS_RE if pattern.search(text_lower))
         if pattern_matches > 0 and len(words) <= 15:
             score += 0.25
-        
-        political_patterns = [
-            r'\b(est|is)\s+(le|la|un|une)\s+(président|president|premier ministre|prime minister|roi|king|reine|queen)',
-            r'\b(est|is)\s+(le|la)\s+(présidente|presidente|president)',
-            r'\b(est|is)\s+(élu|elected|nommé|appointed)\s+(président|president)',
-        ]
-        political_match = any(re.search(pattern, text_lower) for pattern in political_patterns)
+
+        political_match = features.scan_flags["political"]
         if political_match and len(words) <= 15:
             score += 0.35
             if not any(kw in text_lower for kw in ['selon', 'according', 'source', 'selon']):
@@ -180,10 +529,12 @@ class FakeNewsDetector:
         
         return score, "NEGATIVE" if score > 0.5 else "POSITIVE"
     
-    def _analyze_heuristics(self, text: str) -> Dict:
-        text_lower = text.lower()
-        words = text.split()
-        char_count = len(text)
+    def _analyze_heuristics(self, features: _TextFeatures) -> Dict:
+        text = features.text
+        text_lower = features.text_lower
+        words = features.words
+        char_count = features.char_count
+        scan_flags = features.scan_flags
         
         # Indicateurs de suspicion
         red_flags = 0
@@ -191,20 +542,15 @@ class FakeNewsDetector:
         trust_indicators = 0  # Indicateurs de confiance
         
         # 1. Mots-clés alarmistes (mais avec seuil plus strict)
-        alarmist_keywords = [
-            'urgent', 'breaking', 'shocking', 'exposed', 'revealed',
-            'secret', 'hidden truth', 'they don\'t want you to know',
-            'exclusif', 'révélé', 'choc', 'incroyable', 'vous ne le croirez pas'
-        ]
-        alarmist_count = sum(1 for keyword in alarmist_keywords if keyword in text_lower)
+        keyword_counts = features.keyword_counts
+        alarmist_count = keyword_counts["alarmist"]
         if alarmist_count >= 3:
             red_flags += 1
             suspicion_score += 0.2
         elif alarmist_count == 2:
             suspicion_score += 0.1
         
-        death_patterns = ['est mort', 'is dead', 'décédé', 'passed away', 'a été tué', 'has been killed', 'assassiné']
-        death_pattern_found = any(pattern in text_lower for pattern in death_patterns)
+        death_pattern_found = scan_flags["death"]
         if death_pattern_found:
             if len(words) <= 10 and char_count < 100:
                 red_flags += 1
@@ -212,15 +558,16 @@ class FakeNewsDetector:
             elif len(words) <= 20:
                 suspicion_score += 0.15
         
-        caps_ratio = sum(1 for c in text if c.isupper()) / char_count if char_count > 0 else 0
+        # Histogramme de caractères construit en une seule passe : majuscules,
+        # ponctuation et phrases sont ensuite lus dans le résultat
+        caps_count, exclamation_count, question_count, dot_count = _char_stats(text)
+        caps_ratio = caps_count / char_count if char_count > 0 else 0
         if caps_ratio > 0.4:
             red_flags += 1
             suspicion_score += 0.15
         elif caps_ratio > 0.25:
             suspicion_score += 0.08
         
-        exclamation_count = text.count('!')
-        question_count = text.count('?')
         if exclamation_count > char_count * 0.08:
             red_flags += 1
             suspicion_score += 0.12
@@ -229,7 +576,7 @@ class FakeNewsDetector:
         
         # Ne pas pénaliser les textes courts s'ils sont des affirmations factuelles simples
         # (ex: "Messi est argentin" est un fait vérifiable, pas suspect juste parce que court)
-        is_simple_factual_claim = bool(re.search(r'\b(est|is|a été|has been)\s+(le|la|un|une|argentin|français|américain|président)', text_lower))
+        is_simple_factual_claim = scan_flags["simple_factual"]
         
         if char_count < 30 and not is_simple_factual_claim:
             red_flags += 1
@@ -239,13 +586,7 @@ class FakeNewsDetector:
         elif char_count > 200:
             trust_indicators += 1
         
-        source_keywords = [
-            'source', 'according to', 'study', 'research', 'report',
-            'selon', 'étude', 'recherche', 'rapport', 'journal', 'média',
-            'bbc', 'reuters', 'ap news', 'le monde', 'france info',
-            'published', 'publié', 'confirmed', 'confirmé'
-        ]
-        has_sources = any(keyword in text_lower for keyword in source_keywords)
+        has_sources = keyword_counts["source"] > 0
         if has_sources:
             trust_indicators += 2
             suspicion_score -= 0.15
@@ -256,11 +597,7 @@ class FakeNewsDetector:
             red_flags += 1
             suspicion_score += 0.2
         
-        emotional_words = [
-            'amazing', 'incredible', 'unbelievable', 'terrifying', 'horrifying',
-            'incroyable', 'terrifiant', 'horrible', 'épouvantable'
-        ]
-        emotional_count = sum(1 for word in emotional_words if word in text_lower)
+        emotional_count = keyword_counts["emotional"]
         if emotional_count >= 4:
             red_flags += 1
             suspicion_score += 0.12
@@ -268,25 +605,19 @@ class FakeNewsDetector:
             suspicion_score += 0.06
         
         # 8. Structure du texte (phrases complètes = plus fiable)
-        sentence_count = text.count('.') + text.count('!') + text.count('?')
+        sentence_count = dot_count + exclamation_count + question_count
         if sentence_count >= 2 and char_count > 100:
             trust_indicators += 1
         
         # 9. Présence de chiffres/données (indicateur de fiabilité)
-        has_numbers = bool(re.search(r'\d+', text))
+        has_numbers = scan_flags["numbers"]
         if has_numbers and char_count > 100:
             trust_indicators += 1
             suspicion_score -= 0.05
         
         # 10. Détection d'affirmations politiques/historiques factuelles sans source (CRITIQUE)
         # Ces affirmations sont TRÈS suspectes car faciles à vérifier mais souvent fausses
-        political_patterns = [
-            r'\b(est|is)\s+(le|la|un|une)\s+(président|president|premier ministre|prime minister|roi|king|reine|queen)',
-            r'\b(est|is)\s+(le|la)\s+(présidente|presidente|presidante|president)',
-            r'\b(est|is)\s+(élu|elected|nommé|appointed)\s+(président|president)',
-            r'\b(est|is)\s+(le|la)\s+.*(président|president|presidante)',
-        ]
-        political_match = any(re.search(pattern, text_lower) for pattern in political_patterns)
+        political_match = scan_flags["political"]
         if political_match:
             if not has_sources and char_count < 150:
                 # Affirmation politique factuelle sans source = TRÈS TRÈS suspect (probablement fake)
@@ -300,7 +631,7 @@ class FakeNewsDetector:
         
         # 11. Détection de fautes d'orthographe importantes
         # Les fautes d'orthographe dans les affirmations politiques sont un indicateur fort de fake news
-        if re.search(r'\bpresidante\b', text_lower):
+        if scan_flags["presidante"]:
             red_flags += 1
             suspicion_score += 0.3
             # Si combiné avec une affirmation politique, c'est encore plus suspect
@@ -319,15 +650,14 @@ class FakeNewsDetector:
             "emotional_language": emotional_count,
             "trust_indicators": trust_indicators,
             "death_pattern_found": death_pattern_found,
+            "political_match": political_match,
             "char_count": char_count,
             "word_count": len(words)
         }
     
-    def _generate_reasons(self, text: str, score: float, heuristics: Dict, ai_score: float) -> List[str]:
+    def _generate_reasons(self, features: _TextFeatures, score: float, heuristics: Dict, ai_score: float) -> List[str]:
         reasons = []
-        text_lower = text.lower()
-        words = text.split()
-        
+
         # Raisons de suspicion
         if score > 0.7:
             reasons.append("🔴 Score de suspicion très élevé détecté")
@@ -346,13 +676,7 @@ class FakeNewsDetector:
             reasons.append("⚠️ Mention de décès détectée - vérifiez auprès de sources officielles")
         
         # Détection d'affirmations politiques sans source (CRITIQUE)
-        political_patterns = [
-            r'\b(est|is)\s+(le|la|un|une)\s+(président|president|premier ministre|prime minister)',
-            r'\b(est|is)\s+(le|la)\s+(présidente|presidente|presidante|president)',  # Inclut la faute "presidante"
-            r'\b(est|is)\s+(élu|elected|nommé|appointed)\s+(président|president)',
-            r'\b(est|is)\s+(le|la)\s+.*(président|president|presidante)',  # Pattern plus flexible
-        ]
-        political_match = any(re.search(pattern, text_lower) for pattern in political_patterns)
+        political_match = heuristics['political_match']
         if political_match:
             if not heuristics['has_sources'] and heuristics['char_count'] < 150:
                 reasons.append("🔴 Affirmation politique factuelle sans source - TRÈS suspect (fake news probable)")
@@ -361,7 +685,7 @@ class FakeNewsDetector:
             elif heuristics['char_count'] < 100:
                 reasons.append("⚠️ Affirmation politique très courte - vérifiez la source")
         
-        if re.search(r'\bpresidante\b', text_lower):
+        if features.scan_flags["presidante"]:
             reasons.append("🔴 Faute d'orthographe importante détectée (presidante au lieu de présidente) - indicateur de fake news")
         
         if heuristics['alarmist_count'] >= 3:
@@ -399,5 +723,22 @@ class FakeNewsDetector:
         
         if not reasons:
             reasons.append("ℹ️ Analyse effectuée, aucun indicateur majeur détecté")
-        
+
         return reasons
+
+
+# Singleton de module : le chargement du modèle (~400 Mo) ne doit se faire
+# qu'une seule fois par processus, tous les appelants partagent l'instance
+_INSTANCE = None
+_INSTANCE_LOCK = threading.Lock()
+
+
+def get_detector() -> FakeNewsDetector:
+    global _INSTANCE
+    if _INSTANCE is None:
+        # Verrou à double vérification : les analyseurs se chargent
+        # désormais en parallèle et partagent ce singleton coûteux
+        with _INSTANCE_LOCK:
+            if _INSTANCE is None:
+                _INSTANCE = FakeNewsDetector()
+    return _INSTANCE
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    redis = None
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Taille maximale du cache mémoire (fallback sans Redis), ajustable selon
+# la RAM disponible du déploiement
+_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+
+
+def normalized_key(text: str, prefix: str = "") -> str:
+    """
+    Clé de cache stable : espaces normalisés, casse ignorée, condensé blake2b.
+    Deux formulations du même texte ("X est  président" / "x est président")
+    tombent sur la même entrée. blake2b plutôt que sha256 : environ deux fois
+    plus rapide dans hashlib et 128 bits suffisent largement pour des clés de
+    cache — pertinent quand on hache 5KB de texte d'article par requête.
+    """
+    normalized = " ".join(text.lower().split())
+    digest = hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).hexdigest()
+    return f"{prefix}:{digest}" if prefix else digest
+
+
+def exact_key(value: str, prefix: str = "") -> str:
+    """
+    Clé de cache sans repli de casse ni d'espaces, pour les valeurs
+    sensibles à la casse (chemins et paramètres d'URL) que l'appelant a
+    déjà canonicalisées — normalized_key minusculerait tout et ferait
+    entrer en collision /Article-X et /article-x.
+    """
+    digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).hexdigest()
+    return f"{prefix}:{digest}" if prefix else digest
+
+
+def _dumps(value: Any) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value).encode('utf-8')
+
+
+def _loads(raw: bytes) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class _MemoryCache:
+    """LRU + TTL en mémoire process, utilisé quand Redis n'est pas configuré."""
+
+    def __init__(self, max_entries: int = _MAX_ENTRIES):
+        self._entries = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class _RedisCache:
+    """Cache partagé entre processus via Redis (valeurs sérialisées en JSON)."""
+
+    def __init__(self, url: str):
+        self._client = redis.Redis.from_url(url)
+        self._client.ping()
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self._client.get(key)
+        except Exception as e:
+            logger.warning(f"Erreur lecture cache Redis: {e}")
+            return None
+        if raw is None:
+            return None
+        return _loads(raw)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            self._client.setex(key, int(ttl), _dumps(value))
+        except Exception as e:
+            logger.warning(f"Erreur écriture cache Redis: {e}")
+
+
+def _build_cache():
+    url = os.getenv("REDIS_URL")
+    if url and REDIS_AVAILABLE:
+        try:
+            cache = _RedisCache(url)
+            logger.info("Cache Redis activé")
+            return cache
+        except Exception as e:
+            logger.warning(f"Redis indisponible ({e}) - cache mémoire utilisé")
+    return _MemoryCache()
+
+
+# Instance partagée par tous les services du processus
+shared_cache = _build_cache()
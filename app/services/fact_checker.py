@@ -1,25 +1,202 @@
+import asyncio
+import atexit
 import requests
 import logging
 from typing import Dict, List, Optional
 import re
 from urllib.parse import quote
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+from app.services.cache import shared_cache, normalized_key
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Parseur C de lxml quand il est installé, et seuls les <a> nous intéressent :
+# inutile de construire l'arbre complet d'une page DuckDuckGo
+_HTML_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+_ANCHORS_ONLY = SoupStrainer('a')
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    aiohttp = None
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+    httpx = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Durées de vie du cache : les pages de résultats bougent lentement (1h),
+# les verdicts un peu plus vite pour suivre l'actualité (10min)
+_SEARCH_CACHE_TTL = 3600
+_VERDICT_CACHE_TTL = 600
+
+# Patterns et listes de mots-clés précompilés à l'import : rien ici ne
+# dépend de l'entrée, inutile de les reconstruire à chaque appel
+_FACT_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(est|is|a été|has been)\s+(le|la|un|une|président|president|premier ministre)',
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(est mort|is dead|décédé|passed away)',
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(a|has)\s+(gagné|won|élu|elected)',
+    r'(le|la)\s+([A-Z][a-z]+)\s+(est|is)\s+(vrai|true|faux|false)',
+)]
+_CAPITALIZED_RE = re.compile(r'[A-Z][a-z]+')
+_DIGIT_RE = re.compile(r'\d+')
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+
+_TRUE_KEYWORDS = frozenset([
+    'vrai', 'true', 'correct', 'confirmé', 'confirmed', 'vérifié', 'verified',
+    'officiel', 'official', 'source fiable'
+])
+_FALSE_KEYWORDS = frozenset([
+    'faux', 'false', 'fake', 'hoax', 'canular', 'rumeur', 'rumor',
+    'démenti', 'debunked', 'démythifié', 'non vérifié'
+])
+# Une seule alternation compilée : un balayage C du titre remplace
+# N tests substring Python
+_TRUE_RE = re.compile('|'.join(map(re.escape, _TRUE_KEYWORDS)))
+_FALSE_RE = re.compile('|'.join(map(re.escape, _FALSE_KEYWORDS)))
+
+_SOURCE_KEYWORDS = [
+    'snopes', 'factcheck', 'lemonde', 'franceinfo', 'france 24',
+    'bbc', 'reuters', 'ap news', 'the guardian', 'wikipedia',
+    'wikipédia', 'encyclopédie', 'biographie', 'biography'
+]
+_SOURCE_KW_RE = re.compile('|'.join(map(re.escape, _SOURCE_KEYWORDS)))
+
+_KNOWN_FACTS = {
+    "emmanuel macron": {"is_president": True, "country": "France", "since": 2017, "verified": True},
+    "joe biden": {"is_president": True, "country": "USA", "since": 2021, "verified": True},
+    "messi": {"nationality": "argentin", "verified": True},
+    "messi est argentin": {"verified": True, "correct": True},
+    "messi est argentinien": {"verified": True, "correct": True},
+    "messi est français": {"verified": False, "correct": False},
+    "presidante": {"is_correct": False, "correct": "présidente", "verified": False},
+}
+
+# Clés pré-minusculées une fois à l'import : l'ancien code refaisait
+# key.lower() pour chaque clé à chaque message
+_KNOWN_FACTS_ITEMS = tuple((k.lower(), v) for k, v in _KNOWN_FACTS.items())
+_KNOWN_FACTS_MAX_KEY_LEN = max(len(k) for k, _ in _KNOWN_FACTS_ITEMS)
+
+# Pré-filtre : l'immense majorité des messages ne touche aucun fait connu.
+# Si aucun mot du texte n'apparaît dans les clés, on répond négativement
+# sans lancer le balayage complet
+_KNOWN_FACTS_TOKENS = frozenset(
+    tok for k, _ in _KNOWN_FACTS_ITEMS for tok in k.split()
+)
+
+_TOKEN_PUNCT = '.,!?;:"\'()[]'
+
+# Automate Aho-Corasick : toutes les clés trouvées en un seul balayage
+# O(|texte|) au lieu d'un test substring par clé — le coût par message reste
+# constant même avec des milliers de faits connus
+# Coalescing des recherches sortantes : N appels concurrents pour le même
+# texte partagent un seul fetch en vol, et le sémaphore borne le nombre de
+# requêtes DuckDuckGo simultanées pour éviter les 429 sous rafale.
+# Le sémaphore est lié à sa boucle d'événements, donc recréé avec elle
+# (même logique que le client async partagé).
+_INFLIGHT: Dict[str, "asyncio.Future"] = {}
+_SEARCH_LIMITER = None
+_SEARCH_LIMITER_LOOP = None
+
+
+def _get_search_limiter() -> "asyncio.Semaphore":
+    global _SEARCH_LIMITER, _SEARCH_LIMITER_LOOP
+    loop = asyncio.get_running_loop()
+    if _SEARCH_LIMITER is None or _SEARCH_LIMITER_LOOP is not loop:
+        _SEARCH_LIMITER = asyncio.Semaphore(4)
+        _SEARCH_LIMITER_LOOP = loop
+        _INFLIGHT.clear()
+    return _SEARCH_LIMITER
+
+
+def _discard_inflight(cache_key: str):
+    def _done(task: "asyncio.Task") -> None:
+        _INFLIGHT.pop(cache_key, None)
+        if not task.cancelled():
+            task.exception()  # consommé : pas d'avertissement sans attenteur
+    return _done
+
+
+if AHOCORASICK_AVAILABLE:
+    _KNOWN_FACTS_AC = ahocorasick.Automaton()
+    for _i, (_k, _) in enumerate(_KNOWN_FACTS_ITEMS):
+        _KNOWN_FACTS_AC.add_word(_k, (_i, _k))
+    _KNOWN_FACTS_AC.make_automaton()
+else:
+    _KNOWN_FACTS_AC = None
+
 
 class FactChecker:
+    # Clients partagés entre toutes les instances : un FactChecker peut être
+    # créé par message, le pool de connexions keep-alive doit survivre à
+    # l'instance pour amortir TCP/TLS sur toute la vie du bot
+    _sync_session = None
+    _async_client = None
+    _async_client_loop = None
+
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-    
-    def verify_fact(self, text: str) -> Dict:
-        """
-        Vérifie la véracité d'une information en cherchant sur Internet
-        """
+        self.session = self._get_sync_session()
+
+    @classmethod
+    def _get_sync_session(cls):
+        if cls._sync_session is None:
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': _USER_AGENT
+            })
+            # Réutilisation TCP/TLS sur le chemin synchrone : un pool de
+            # connexions keep-alive évite une poignée de main par requête
+            adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            cls._sync_session = session
+        return cls._sync_session
+
+    def _get_async_client(self):
+        # Les connexions httpx/aiohttp sont liées à leur boucle d'événements :
+        # on recrée le client si la boucle a changé (asyncio.run côté sync en
+        # ouvre une par appel), sinon on réutilise le pool existant
+        cls = FactChecker
+        loop = asyncio.get_running_loop()
+        if cls._async_client is None or cls._async_client_loop is not loop:
+            stale, stale_loop = cls._async_client, cls._async_client_loop
+            if stale is not None and stale_loop is not None and not stale_loop.is_closed():
+                # L'ancienne boucle vit encore (autre thread) : on lui confie
+                # la fermeture du client périmé au lieu de fuir ses sockets
+                coro = (stale.aclose()
+                        if HTTPX_AVAILABLE and isinstance(stale, httpx.AsyncClient)
+                        else stale.close())
+                try:
+                    asyncio.run_coroutine_threadsafe(coro, stale_loop)
+                except RuntimeError:
+                    coro.close()
+            cls._async_client = self._open_async_client()
+            cls._async_client_loop = loop
+        return cls._async_client
+
+    def _verify_fact_precheck(self, text: str) -> Optional[Dict]:
+        """Réponses immédiates communes aux chemins sync et async"""
         if not text or len(text.strip()) < 10:
             return {
                 "verified": None,
@@ -27,141 +204,318 @@ class FactChecker:
                 "sources": [],
                 "method": "insufficient_text"
             }
-        
-        search_result = self._search_web(text)
-        
-        if search_result.get("sources_found", 0) > 0:
-            analysis = self._analyze_search_results(text, search_result)
+
+        # Base de faits locale d'abord : une correspondance sûre répond en
+        # microsecondes au lieu de 1 à 8s de recherche web, et soulage le
+        # quota DuckDuckGo
+        local = self.check_against_known_facts(text)
+        if local["verified_as_true"] or local["verified_as_false"]:
             return {
-                "verified": analysis.get("verified"),
-                "confidence": analysis.get("confidence", 0.5),
-                "sources": search_result.get("sources", []),
-                "method": "web_search",
-                "search_query": search_result.get("query"),
-                "results_count": search_result.get("results_count", 0)
+                "verified": local["verified_as_true"],
+                "confidence": 0.9,
+                "sources": [],
+                "method": "known_facts",
+                "matches": local["matches"]
             }
-        
+
+        # Un même texte viral revient souvent : un hit de cache remplace
+        # plusieurs secondes de recherche web par quelques microsecondes
+        return shared_cache.get(normalized_key(text, prefix="verify"))
+
+    def verify_fact(self, text: str) -> Dict:
+        """
+        Vérifie la véracité d'une information en cherchant sur Internet
+        """
+        early = self._verify_fact_precheck(text)
+        if early is not None:
+            return early
+
+        result = None
+        if HTTPX_AVAILABLE or AIOHTTP_AVAILABLE:
+            try:
+                # Les requêtes partent en parallèle : la latence totale est
+                # celle de la requête la plus lente, pas la somme
+                result = asyncio.run(self._verify_fact_transient(text))
+            except RuntimeError:
+                # Déjà dans une boucle d'événements : repli synchrone
+                logger.debug("Boucle asyncio active - repli sur la recherche synchrone")
+
+        if result is None:
+            result = self._verify_fact_sync(text)
+
+        shared_cache.set(normalized_key(text, prefix="verify"), result, ttl=_VERDICT_CACHE_TTL)
+        return result
+
+    async def verify_fact_async(self, text: str) -> Dict:
+        """
+        Variante coroutine de verify_fact, à awaiter depuis une boucle active
+        (le chemin sync passe par asyncio.run et ne peut pas y tourner)
+        """
+        early = self._verify_fact_precheck(text)
+        if early is not None:
+            return early
+
+        if HTTPX_AVAILABLE or AIOHTTP_AVAILABLE:
+            result = await self._verify_fact_async(text)
+        else:
+            result = await asyncio.to_thread(self._verify_fact_sync, text)
+
+        shared_cache.set(normalized_key(text, prefix="verify"), result, ttl=_VERDICT_CACHE_TTL)
+        return result
+
+    def _verify_fact_sync(self, text: str) -> Dict:
+        search_result = self._search_web(text)
+
+        if search_result.get("sources_found", 0) > 0:
+            return self._web_search_verdict(text, search_result)
+
         facts = self._extract_facts(text)
         if facts:
-            verification_results = []
-            for fact in facts[:3]:
-                result = self._check_fact(fact, text)
-                verification_results.append(result)
-            
-            verified_count = sum(1 for r in verification_results if r.get('verified') is True)
-            false_count = sum(1 for r in verification_results if r.get('verified') is False)
-            total_count = len(verification_results)
-            
-            if false_count > verified_count:
-                verified = False
-                confidence = min(0.9, 0.5 + (false_count / total_count) * 0.3)
-            elif verified_count > 0:
-                verified = True
-                confidence = min(0.9, 0.5 + (verified_count / total_count) * 0.3)
+            verification_results = [self._check_fact(fact, text) for fact in facts[:3]]
+            return self._aggregate_fact_results(facts, verification_results)
+
+        return {
+            "verified": None,
+            "confidence": 0.3,
+            "sources": [],
+            "method": "no_results"
+        }
+
+    def _open_async_client(self):
+        if HTTPX_AVAILABLE:
+            # HTTP/2 : les requêtes simultanées multiplexent sur une seule
+            # connexion TLS, une poignée de main au lieu d'une par requête
+            return httpx.AsyncClient(
+                http2=True,
+                headers={'User-Agent': _USER_AGENT},
+                timeout=8.0,
+                limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60),
+            )
+        return aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=8),
+                                     headers={'User-Agent': _USER_AGENT})
+
+    async def _verify_fact_transient(self, text: str) -> Dict:
+        """
+        Variante à client éphémère pour le chemin asyncio.run : chaque appel
+        y crée sa propre boucle, un client "partagé" y serait recréé à chaque
+        fois et abandonné avec ses connexions ouvertes
+        """
+        session = self._open_async_client()
+        try:
+            return await self._verify_fact_async(text, session)
+        finally:
+            if HTTPX_AVAILABLE and isinstance(session, httpx.AsyncClient):
+                await session.aclose()
             else:
-                verified = None
-                confidence = 0.3
-            
-            return {
-                "verified": verified,
-                "confidence": float(confidence),
-                "facts_checked": len(facts),
-                "results": verification_results,
-                "method": "fact_extraction"
-            }
-        
+                await session.close()
+
+    async def _verify_fact_async(self, text: str, session=None) -> Dict:
+        if session is None:
+            session = self._get_async_client()
+        search_result = await self._search_web_async(session, text)
+
+        if search_result.get("sources_found", 0) > 0:
+            return self._web_search_verdict(text, search_result)
+
+        facts = self._extract_facts(text)
+        if facts:
+            # Les vérifications de faits partent toutes en même temps
+            verification_results = await asyncio.gather(
+                *[self._check_fact_async(session, fact) for fact in facts[:3]]
+            )
+            return self._aggregate_fact_results(facts, list(verification_results))
+
         return {
             "verified": None,
             "confidence": 0.3,
             "sources": [],
             "method": "no_results"
         }
-    
+
+    def _web_search_verdict(self, text: str, search_result: Dict) -> Dict:
+        analysis = self._analyze_search_results(text, search_result)
+        return {
+            "verified": analysis.get("verified"),
+            "confidence": analysis.get("confidence", 0.5),
+            "sources": search_result.get("sources", []),
+            "method": "web_search",
+            "search_query": search_result.get("query"),
+            "results_count": search_result.get("results_count", 0)
+        }
+
+    def _aggregate_fact_results(self, facts: List[str], verification_results: List[Dict]) -> Dict:
+        verified_count = sum(1 for r in verification_results if r.get('verified') is True)
+        false_count = sum(1 for r in verification_results if r.get('verified') is False)
+        total_count = len(verification_results)
+
+        if false_count > verified_count:
+            verified = False
+            confidence = min(0.9, 0.5 + (false_count / total_count) * 0.3)
+        elif verified_count > 0:
+            verified = True
+            confidence = min(0.9, 0.5 + (verified_count / total_count) * 0.3)
+        else:
+            verified = None
+            confidence = 0.3
+
+        return {
+            "verified": verified,
+            "confidence": float(confidence),
+            "facts_checked": len(facts),
+            "results": verification_results,
+            "method": "fact_extraction"
+        }
+
     def _extract_facts(self, text: str) -> List[str]:
         """
         Extrait les faits vérifiables du texte
         """
         facts = []
-        text_lower = text.lower()
-        
-        patterns = [
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(est|is|a été|has been)\s+(le|la|un|une|président|president|premier ministre)',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(est mort|is dead|décédé|passed away)',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(a|has)\s+(gagné|won|élu|elected)',
-            r'(le|la)\s+([A-Z][a-z]+)\s+(est|is)\s+(vrai|true|faux|false)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+
+        for pattern in _FACT_PATTERNS:
+            for match in pattern.finditer(text):
                 fact = match.group(0).strip()
                 if len(fact) > 10 and len(fact) < 200:
                     facts.append(fact)
-        
+
         if not facts:
-            sentences = re.split(r'[.!?]+', text)
+            sentences = _SENTENCE_SPLIT_RE.split(text)
             for sentence in sentences:
                 sentence = sentence.strip()
-                if (len(sentence) > 15 and len(sentence) < 150 and 
-                    (re.search(r'[A-Z][a-z]+', sentence) or re.search(r'\d+', sentence))):
+                if (len(sentence) > 15 and len(sentence) < 150 and
+                    (_CAPITALIZED_RE.search(sentence) or _DIGIT_RE.search(sentence))):
                     facts.append(sentence)
-        
+
         return facts[:5]
-    
+
+    def _build_queries(self, text: str) -> List[str]:
+        return [
+            f'"{text}"',
+            f'{text} vérification',
+            f'{text} fact-check',
+            f'{text} vrai ou faux'
+        ]
+
     def _search_web(self, text: str) -> Dict:
         """
         Recherche sur Internet pour vérifier l'information
         Utilise plusieurs requêtes pour maximiser les résultats
         """
+        cache_key = normalized_key(text, prefix="search")
+        cached = shared_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         all_results = []
-        all_sources = []
-        
-        search_queries = [
-            f'"{text}"',
-            f'{text} vérification',
-            f'{text} fact-check',
-            f'{text} vrai ou faux'
-        ]
-        
-        for query in search_queries[:2]:
+        seen_titles = set()
+
+        for query in self._build_queries(text)[:2]:
             try:
                 search_url = f"https://html.duckduckgo.com/html/?q={quote(query)}"
                 response = self.session.get(search_url, timeout=8)
-                
+
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    for result in soup.find_all('a', class_='result__a', limit=10):
-                        title = result.get_text(strip=True)
-                        href = result.get('href', '')
-                        if title and href and title not in [r['title'] for r in all_results]:
-                            all_results.append({"title": title, "url": href})
-                    
-                    for link in soup.find_all('a', href=True):
-                        title = link.get_text(strip=True)
-                        href = link.get('href', '')
-                        if title and len(title) > 10 and 'duckduckgo.com' not in href:
-                            if title not in [r['title'] for r in all_results]:
-                                all_results.append({"title": title, "url": href})
-                
+                    self._parse_search_page(response.content, all_results, seen_titles)
+
             except Exception as e:
                 logger.warning(f"Erreur recherche web pour '{query}': {e}")
-        
-        source_keywords = [
-            'snopes', 'factcheck', 'lemonde', 'franceinfo', 'france 24',
-            'bbc', 'reuters', 'ap news', 'the guardian', 'wikipedia',
-            'wikipédia', 'encyclopédie', 'biographie', 'biography'
-        ]
-        
+
+        search_result = self._build_search_result(text, all_results)
+        shared_cache.set(cache_key, search_result, ttl=_SEARCH_CACHE_TTL)
+        return search_result
+
+    async def _search_web_async(self, session, text: str) -> Dict:
+        """
+        Version asynchrone de la recherche : les requêtes DuckDuckGo
+        partent en parallèle via asyncio.gather
+        """
+        cache_key = normalized_key(text, prefix="search")
+        cached = shared_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        limiter = _get_search_limiter()
+        task = _INFLIGHT.get(cache_key)
+        if task is None:
+            # La recherche vit dans sa propre tâche, simplement attendue par
+            # chaque appelant : l'annulation d'un attenteur (déconnexion
+            # client) n'annule que son attente, pas la recherche partagée —
+            # sinon son CancelledError empoisonnerait tous les doublons
+            task = asyncio.get_running_loop().create_task(
+                self._search_web_uncached(session, text, cache_key, limiter)
+            )
+            _INFLIGHT[cache_key] = task
+            task.add_done_callback(_discard_inflight(cache_key))
+        return await asyncio.shield(task)
+
+    async def _search_web_uncached(self, session, text: str, cache_key: str,
+                                   limiter: "asyncio.Semaphore") -> Dict:
+        queries = self._build_queries(text)[:2]
+
+        async def _limited_fetch(query):
+            async with limiter:
+                return await self._fetch(session, query)
+
+        pages = await asyncio.gather(
+            *[_limited_fetch(query) for query in queries],
+            return_exceptions=True
+        )
+
+        all_results = []
+        seen_titles = set()
+        for query, page in zip(queries, pages):
+            if isinstance(page, Exception):
+                logger.warning(f"Erreur recherche web pour '{query}': {page}")
+                continue
+            if page:
+                self._parse_search_page(page, all_results, seen_titles)
+
+        search_result = self._build_search_result(text, all_results)
+        shared_cache.set(cache_key, search_result, ttl=_SEARCH_CACHE_TTL)
+        return search_result
+
+    async def _fetch(self, session, query: str) -> Optional[str]:
+        search_url = f"https://html.duckduckgo.com/html/?q={quote(query)}"
+        if HTTPX_AVAILABLE and isinstance(session, httpx.AsyncClient):
+            response = await session.get(search_url)
+            return response.text if response.status_code == 200 else None
+        async with session.get(search_url) as response:
+            if response.status != 200:
+                return None
+            return await response.text()
+
+    def _parse_search_page(self, html, all_results: List[Dict], seen_titles: set) -> None:
+        # Dédoublonnage par set O(1) : l'ancien "title not in [r['title'] ...]"
+        # reconstruisait une liste et la balayait pour chaque lien de la page
+        soup = BeautifulSoup(html, _HTML_PARSER, parse_only=_ANCHORS_ONLY)
+
+        for result in soup.find_all('a', class_='result__a', limit=10):
+            title = result.get_text(strip=True)
+            href = result.get('href', '')
+            if title and href and title not in seen_titles:
+                seen_titles.add(title)
+                all_results.append({"title": title, "url": href})
+
+        for link in soup.find_all('a', href=True):
+            title = link.get_text(strip=True)
+            href = link.get('href', '')
+            if title and len(title) > 10 and 'duckduckgo.com' not in href:
+                if title not in seen_titles:
+                    seen_titles.add(title)
+                    all_results.append({"title": title, "url": href})
+
+    def _build_search_result(self, text: str, all_results: List[Dict]) -> Dict:
+        all_sources = []
+        seen_source_ids = set()
         for result in all_results:
-            title_lower = result['title'].lower()
-            url_lower = result['url'].lower()
-            for keyword in source_keywords:
-                if keyword in title_lower or keyword in url_lower:
-                    if result not in all_sources:
-                        all_sources.append(result)
-                    break
-        
+            source_id = (result['title'], result['url'])
+            if source_id in seen_source_ids:
+                continue
+            if (_SOURCE_KW_RE.search(result['title'].lower())
+                    or _SOURCE_KW_RE.search(result['url'].lower())):
+                seen_source_ids.add(source_id)
+                all_sources.append(result)
+
         return {
             "query": text,
             "results": all_results[:15],
@@ -169,54 +523,37 @@ class FactChecker:
             "results_count": len(all_results),
             "sources_found": len(all_sources)
         }
-    
+
     def _analyze_search_results(self, text: str, search_result: Dict) -> Dict:
         """
         Analyse les résultats de recherche pour déterminer si l'info est vraie ou fausse
         """
-        text_lower = text.lower()
         results = search_result.get("results", [])
         sources = search_result.get("sources", [])
-        
-        true_keywords = [
-            'vrai', 'true', 'correct', 'confirmé', 'confirmed', 'vérifié', 'verified',
-            'officiel', 'official', 'source fiable'
-        ]
-        
-        false_keywords = [
-            'faux', 'false', 'fake', 'hoax', 'canular', 'rumeur', 'rumor',
-            'démenti', 'debunked', 'démythifié', 'non vérifié'
-        ]
-        
+
         true_count = 0
         false_count = 0
         neutral_count = 0
-        
+
         for result in results:
             title_lower = result.get('title', '').lower()
-            url_lower = result.get('url', '').lower()
-            
-            has_true = any(kw in title_lower for kw in true_keywords)
-            has_false = any(kw in title_lower for kw in false_keywords)
-            
-            if has_false:
+
+            if _FALSE_RE.search(title_lower):
                 false_count += 1
-            elif has_true:
+            elif _TRUE_RE.search(title_lower):
                 true_count += 1
             else:
                 neutral_count += 1
-        
+
         if sources:
             for source in sources:
                 title_lower = source.get('title', '').lower()
-                has_false = any(kw in title_lower for kw in false_keywords)
-                has_true = any(kw in title_lower for kw in true_keywords)
-                
-                if has_false:
+
+                if _FALSE_RE.search(title_lower):
                     false_count += 2
-                elif has_true:
+                elif _TRUE_RE.search(title_lower):
                     true_count += 2
-        
+
         total_signals = true_count + false_count
         if total_signals == 0:
             verified = None
@@ -230,19 +567,15 @@ class FactChecker:
         else:
             verified = None
             confidence = 0.4
-        
+
         return {
             "verified": verified,
             "confidence": float(confidence),
             "true_signals": true_count,
             "false_signals": false_count
         }
-    
-    def _check_fact(self, fact: str, original_text: str) -> Dict:
-        """
-        Vérifie un fait spécifique en cherchant sur le web
-        """
-        search_result = self._search_web(fact)
+
+    def _fact_result(self, fact: str, search_result: Dict) -> Dict:
         if search_result.get("sources_found", 0) > 0:
             analysis = self._analyze_search_results(fact, search_result)
             return {
@@ -252,7 +585,7 @@ class FactChecker:
                 "method": "web_search",
                 "sources_found": search_result.get("sources_found", 0)
             }
-        
+
         return {
             "fact": fact,
             "verified": None,
@@ -260,40 +593,65 @@ class FactChecker:
             "method": "no_results",
             "sources_found": 0
         }
-    
+
+    def _check_fact(self, fact: str, original_text: str) -> Dict:
+        """
+        Vérifie un fait spécifique en cherchant sur le web
+        """
+        return self._fact_result(fact, self._search_web(fact))
+
+    async def _check_fact_async(self, session, fact: str) -> Dict:
+        return self._fact_result(fact, await self._search_web_async(session, fact))
+
     def check_against_known_facts(self, text: str) -> Dict:
         """
         Vérifie contre une base de faits connus (exemples)
         """
         text_lower = text.lower()
-        
-        known_facts = {
-            "emmanuel macron": {"is_president": True, "country": "France", "since": 2017, "verified": True},
-            "joe biden": {"is_president": True, "country": "USA", "since": 2021, "verified": True},
-            "messi": {"nationality": "argentin", "verified": True},
-            "messi est argentin": {"verified": True, "correct": True},
-            "messi est argentinien": {"verified": True, "correct": True},
-            "messi est français": {"verified": False, "correct": False},
-            "presidante": {"is_correct": False, "correct": "présidente", "verified": False},
-        }
-        
+
+        # Sortie rapide : aucun mot commun avec la base de faits, inutile de
+        # balayer les clés (heuristique par mots entiers, les correspondances
+        # collées à de la ponctuation sont couvertes par le strip)
+        if not any(tok.strip(_TOKEN_PUNCT) in _KNOWN_FACTS_TOKENS
+                   for tok in text_lower.split()):
+            return {
+                "matches": [],
+                "count": 0,
+                "verified_as_true": False,
+                "verified_as_false": False
+            }
+
         matches = []
         verified_as_true = False
         verified_as_false = False
-        
-        for key, fact_data in known_facts.items():
-            key_lower = key.lower()
-            if key_lower in text_lower or text_lower in key_lower:
-                matches.append({
-                    "fact": key,
-                    "data": fact_data,
-                    "verified": fact_data.get("verified", True)
-                })
-                if fact_data.get("verified") is True and fact_data.get("correct", True):
-                    verified_as_true = True
-                elif fact_data.get("verified") is False or fact_data.get("correct") is False:
-                    verified_as_false = True
-        
+
+        matched = set()
+        if _KNOWN_FACTS_AC is not None:
+            for _, (idx, _key) in _KNOWN_FACTS_AC.iter(text_lower):
+                matched.add(idx)
+            # Cas inverse (texte contenu dans une clé) : ne concerne que les
+            # textes plus courts que la clé la plus longue
+            if len(text_lower) <= _KNOWN_FACTS_MAX_KEY_LEN:
+                for idx, (key, _) in enumerate(_KNOWN_FACTS_ITEMS):
+                    if idx not in matched and text_lower in key:
+                        matched.add(idx)
+        else:
+            for idx, (key, _) in enumerate(_KNOWN_FACTS_ITEMS):
+                if key in text_lower or text_lower in key:
+                    matched.add(idx)
+
+        for idx in sorted(matched):
+            key, fact_data = _KNOWN_FACTS_ITEMS[idx]
+            matches.append({
+                "fact": key,
+                "data": fact_data,
+                "verified": fact_data.get("verified", True)
+            })
+            if fact_data.get("verified") is True and fact_data.get("correct", True):
+                verified_as_true = True
+            elif fact_data.get("verified") is False or fact_data.get("correct") is False:
+                verified_as_false = True
+
         if "messi" in text_lower and ("argentin" in text_lower or "argentine" in text_lower):
             verified_as_true = True
             matches.append({
@@ -301,7 +659,7 @@ class FactChecker:
                 "data": {"verified": True, "correct": True},
                 "verified": True
             })
-        
+
         return {
             "matches": matches,
             "count": len(matches),
@@ -309,3 +667,20 @@ class FactChecker:
             "verified_as_false": verified_as_false
         }
 
+
+def _close_shared_client() -> None:
+    # Fermeture propre du client partagé à l'arrêt du processus (au mieux :
+    # la boucle d'origine est souvent déjà fermée à ce stade)
+    client = FactChecker._async_client
+    if client is None:
+        return
+    try:
+        if HTTPX_AVAILABLE and isinstance(client, httpx.AsyncClient):
+            asyncio.run(client.aclose())
+        else:
+            asyncio.run(client.close())
+    except Exception:
+        pass
+
+
+atexit.register(_close_shared_client)
@@ -1,83 +1,173 @@
-from app.models.fake_news_detector import FakeNewsDetector
+from app.models.fake_news_detector import get_detector
 from app.services.fact_checker import FactChecker
+from app.services.cache import shared_cache, normalized_key
 from typing import Dict
+import asyncio
 import logging
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Une analyse complète coûte une inférence modèle plus des secondes de
+# recherche web ; les textes viraux reviennent tels quels, un hit répond
+# en microsecondes
+_ANALYSIS_CACHE_TTL = 3600
+
+_POSITIVE_WORDS = ('good', 'great', 'excellent', 'positive', 'success', 'happy')
+_NEGATIVE_WORDS = ('bad', 'terrible', 'awful', 'negative', 'failure', 'sad', 'horrible')
+_NEUTRAL_WORDS = ('fact', 'information', 'data', 'report', 'study')
+
+# Automate Aho-Corasick construit une fois à l'import : un seul balayage
+# O(|texte|) pour les trois classes au lieu de 18 scans substring — sensible
+# sur les articles longs extraits d'URL
+if AHOCORASICK_AVAILABLE:
+    _SENTIMENT_AC = ahocorasick.Automaton()
+    for _cls, _words in (("positive", _POSITIVE_WORDS),
+                         ("negative", _NEGATIVE_WORDS),
+                         ("neutral", _NEUTRAL_WORDS)):
+        for _w in _words:
+            _SENTIMENT_AC.add_word(_w, (_cls, _w))
+    _SENTIMENT_AC.make_automaton()
+else:
+    _SENTIMENT_AC = None
+
 
 class TextAnalyzer:
     def __init__(self):
-        self.detector = FakeNewsDetector()
+        self.detector = get_detector()
         self.fact_checker = FactChecker()
         logger.info("TextAnalyzer initialisé")
     
-    def analyze(self, text: str) -> Dict:
+    async def analyze(self, text: str) -> Dict:
         """
         Analyse un texte pour détecter la désinformation
-        
+
+        L'inférence locale, la base de faits et la vérification web partent
+        en parallèle : l'aller-retour HTTP du fact-checking recouvre le
+        temps de calcul du détecteur au lieu de s'y ajouter
+
         Args:
             text: Le texte à analyser
-            
+
         Returns:
             Dictionnaire avec les résultats de l'analyse
         """
         try:
+            cache_key = normalized_key(text, prefix="analyze")
+            cached = shared_cache.get(cache_key)
+            if cached is not None:
+                # Copie superficielle : les appelants peuvent retoucher le
+                # dictionnaire sans corrompre l'entrée en cache
+                return dict(cached)
+
+            detection_result, fact_check, known_facts_check = await asyncio.gather(
+                asyncio.to_thread(self.detector.detect_fake_news, text),
+                self.fact_checker.verify_fact_async(text),
+                asyncio.to_thread(self.fact_checker.check_against_known_facts, text),
+            )
+            result = self._build_analysis(text, detection_result, fact_check, known_facts_check)
+            shared_cache.set(cache_key, dict(result), ttl=_ANALYSIS_CACHE_TTL)
+            return result
+
+        except Exception as e:
+            logger.error(f"Erreur lors de l'analyse du texte: {e}")
+            raise
+
+    def analyze_sync(self, text: str) -> Dict:
+        """
+        Version séquentielle pour les appelants hors boucle d'événements
+        (analyse d'image dans un worker, scripts)
+        """
+        try:
+            cache_key = normalized_key(text, prefix="analyze")
+            cached = shared_cache.get(cache_key)
+            if cached is not None:
+                return dict(cached)
+
             detection_result = self.detector.detect_fake_news(text)
             known_facts_check = self.fact_checker.check_against_known_facts(text)
             fact_check = self.fact_checker.verify_fact(text)
-            sentiment = self._analyze_sentiment(text)
-            metrics = self._calculate_metrics(text)
-            
-            if fact_check.get("verified") is False and fact_check.get("confidence", 0) > 0.5:
-                detection_result["confidence"] = min(1.0, detection_result["confidence"] + 0.3)
-                detection_result["is_fake"] = True
-                detection_result["verdict"] = "fake"
-                detection_result["reliability"] = (1.0 - detection_result["confidence"]) * 100
-            elif fact_check.get("verified") is True and fact_check.get("confidence", 0) > 0.5:
-                detection_result["confidence"] = max(0.0, detection_result["confidence"] - 0.35)
-                detection_result["is_fake"] = False
-                detection_result["verdict"] = "probablement_vrai"
-                detection_result["reliability"] = (1.0 - detection_result["confidence"]) * 100
-            elif known_facts_check.get("verified_as_true"):
-                detection_result["confidence"] = max(0.0, detection_result["confidence"] - 0.3)
-                detection_result["is_fake"] = False
-                detection_result["verdict"] = "probablement_vrai"
-                detection_result["reliability"] = (1.0 - detection_result["confidence"]) * 100
-            elif known_facts_check.get("verified_as_false"):
-                detection_result["confidence"] = min(1.0, detection_result["confidence"] + 0.25)
-                detection_result["is_fake"] = True
-                detection_result["verdict"] = "fake"
-                detection_result["reliability"] = (1.0 - detection_result["confidence"]) * 100
-            
-            detection_result["reliability"] = (1.0 - detection_result["confidence"]) * 100
-            
-            return {
-                "type": "text",
-                "input": text[:200] + "..." if len(text) > 200 else text,
-                "detection": detection_result,
-                "fact_check": fact_check,
-                "known_facts": known_facts_check,
-                "sentiment": sentiment,
-                "metrics": metrics,
-                "recommendation": self._generate_recommendation(detection_result, sentiment, fact_check, known_facts_check)
-            }
-        
+            result = self._build_analysis(text, detection_result, fact_check, known_facts_check)
+            shared_cache.set(cache_key, dict(result), ttl=_ANALYSIS_CACHE_TTL)
+            return result
+
         except Exception as e:
             logger.error(f"Erreur lors de l'analyse du texte: {e}")
             raise
-    
+
+    def _build_analysis(self, text: str, detection_result: Dict,
+                        fact_check: Dict, known_facts_check: Dict) -> Dict:
+        sentiment = self._analyze_sentiment(text)
+        metrics = self._calculate_metrics(text)
+
+        # Lectures uniques : verified/confidence étaient relus à chaque
+        # branche, et reliability recalculée dans chaque branche puis une
+        # fois de plus inconditionnellement juste après
+        verified = fact_check.get("verified")
+        fc_conf = fact_check.get("confidence", 0.0)
+
+        adjustment = None
+        if verified is False and fc_conf > 0.5:
+            adjustment = (0.3, True, "fake")
+        elif verified is True and fc_conf > 0.5:
+            adjustment = (-0.35, False, "probablement_vrai")
+        elif known_facts_check.get("verified_as_true"):
+            adjustment = (-0.3, False, "probablement_vrai")
+        elif known_facts_check.get("verified_as_false"):
+            adjustment = (0.25, True, "fake")
+
+        if adjustment is not None:
+            delta, is_fake, verdict = adjustment
+            detection_result["confidence"] = min(1.0, max(0.0, detection_result["confidence"] + delta))
+            detection_result["is_fake"] = is_fake
+            detection_result["verdict"] = verdict
+
+        detection_result["reliability"] = (1.0 - detection_result["confidence"]) * 100
+
+        return {
+            "type": "text",
+            "input": text[:200] + "..." if len(text) > 200 else text,
+            "detection": detection_result,
+            "fact_check": fact_check,
+            "known_facts": known_facts_check,
+            "sentiment": sentiment,
+            "metrics": metrics,
+            "recommendation": self._generate_recommendation(detection_result, sentiment, fact_check, known_facts_check)
+        }
+
     def _analyze_sentiment(self, text: str) -> Dict:
         text_lower = text.lower()
-        
-        positive_words = ['good', 'great', 'excellent', 'positive', 'success', 'happy']
-        negative_words = ['bad', 'terrible', 'awful', 'negative', 'failure', 'sad', 'horrible']
-        neutral_words = ['fact', 'information', 'data', 'report', 'study']
-        
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
-        neutral_count = sum(1 for word in neutral_words if word in text_lower)
+
+        # Comptage d'occurrences plutôt que de simple présence : les anciens
+        # tests "word in text" plafonnaient chaque mot à 1, ce qui écrasait
+        # le signal sur les articles longs
+        if _SENTIMENT_AC is not None:
+            counts = {"positive": 0, "negative": 0, "neutral": 0}
+            for _, (cls, _word) in _SENTIMENT_AC.iter(text_lower):
+                counts[cls] += 1
+            positive_count = counts["positive"]
+            negative_count = counts["negative"]
+            neutral_count = counts["neutral"]
+        else:
+            # str.count : un balayage C par mot, pas de boucle Python par
+            # correspondance
+            positive_count = sum(text_lower.count(w) for w in _POSITIVE_WORDS)
+            negative_count = sum(text_lower.count(w) for w in _NEGATIVE_WORDS)
+            neutral_count = sum(text_lower.count(w) for w in _NEUTRAL_WORDS)
         
         total = positive_count + negative_count + neutral_count
         if total == 0:
@@ -99,16 +189,45 @@ class TextAnalyzer:
             "bias_detected": abs(score - 0.5) > 0.3
         }
     
+    def _scan_counts(self, text: str):
+        """
+        Compte mots et phrases. Sur les articles longs, un seul passage
+        vectorisé sur les octets remplace les split() multiples et leurs
+        listes intermédiaires (même approche que les stats de caractères
+        du détecteur)
+        """
+        if NUMPY_AVAILABLE and len(text) > 1024:
+            data = np.frombuffer(text.encode('utf-8', 'ignore'), dtype=np.uint8)
+            if data.size:
+                is_space = (data == 32) | ((data >= 9) & (data <= 13))
+                nonspace = ~is_space
+                word_count = int(nonspace[0]) + int(
+                    np.count_nonzero(nonspace[1:] & ~nonspace[:-1])
+                )
+                # Une phrase = un segment entre points contenant autre chose
+                # que des espaces : on compte les segments distincts touchés
+                content = nonspace & (data != 46)
+                segment_ids = np.cumsum(data == 46)[content]
+                if segment_ids.size:
+                    sentence_count = 1 + int(np.count_nonzero(np.diff(segment_ids)))
+                else:
+                    sentence_count = 0
+                return word_count, sentence_count
+            return 0, 0
+
+        word_count = len(text.split())
+        sentence_count = sum(1 for s in text.split('.') if s.strip())
+        return word_count, sentence_count
+
     def _calculate_metrics(self, text: str) -> Dict:
-        words = text.split()
-        sentences = text.split('.')
-        
+        word_count, sentence_count = self._scan_counts(text)
+
         return {
-            "word_count": len(words),
-            "sentence_count": len([s for s in sentences if s.strip()]),
-            "avg_words_per_sentence": len(words) / max(len([s for s in sentences if s.strip()]), 1),
+            "word_count": word_count,
+            "sentence_count": sentence_count,
+            "avg_words_per_sentence": word_count / max(sentence_count, 1),
             "char_count": len(text),
-            "readability": "facile" if len(words) < 20 else "moyen" if len(words) < 50 else "complexe"
+            "readability": "facile" if word_count < 20 else "moyen" if word_count < 50 else "complexe"
         }
     
     def _generate_recommendation(self, detection: Dict, sentiment: Dict, fact_check: Dict = None, known_facts: Dict = None) -> str:
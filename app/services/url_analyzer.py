@@ -1,32 +1,182 @@
 from app.services.text_analyzer import TextAnalyzer
 from app.services.url_security_checker import URLSecurityChecker
+from app.services.cache import shared_cache, exact_key
 from typing import Dict
+from functools import lru_cache
+import asyncio
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import logging
-from urllib.parse import urlparse
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    aiohttp = None
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Parseur C de lxml quand il est installé ; le strainer ne matérialise que
+# les noeuds utiles — scripts, styles et div imbriquées (texte dupliqué en
+# cascade) ne sont jamais construits, plus besoin de les decompose()
+_HTML_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+_CONTENT_STRAINER = SoupStrainer(['title', 'meta', 'p', 'article'])
+
+_MAX_CONTENT_CHARS = 5000
+
+# Seuls ~5000 caractères de texte survivent à l'extraction : un préfixe de
+# 256KB suffit largement pour <title>, <meta> et plusieurs paragraphes,
+# inutile de télécharger des pages de plusieurs Mo (lxml se remet sans
+# problème d'un HTML tronqué)
+_MAX_FETCH_BYTES = 256 * 1024
+_FETCH_CHUNK = 16384
+
+# Un même lien repartagé revient souvent : le scrape, les sondes sécurité et
+# l'analyse du texte sont rejouables depuis le cache pendant une heure
+_ANALYSIS_CACHE_TTL = 3600
+
+# Coalescing des analyses en vol : une URL virale soumise N fois en même
+# temps ne déclenche qu'un seul fetch, les doublons attendent le même
+# résultat au lieu de marteler l'origine (même logique que les recherches
+# du FactChecker). Lié à sa boucle d'événements, purgé quand elle change
+_INFLIGHT: Dict[str, "asyncio.Future"] = {}
+_INFLIGHT_LOOP = None
+
+
+def _get_inflight() -> Dict[str, "asyncio.Future"]:
+    global _INFLIGHT_LOOP
+    loop = asyncio.get_running_loop()
+    if _INFLIGHT_LOOP is not loop:
+        _INFLIGHT.clear()
+        _INFLIGHT_LOOP = loop
+    return _INFLIGHT
+
+
+def _discard_inflight(cache_key: str):
+    def _done(task: "asyncio.Task") -> None:
+        _INFLIGHT.pop(cache_key, None)
+        if not task.cancelled():
+            task.exception()  # consommé : pas d'avertissement sans attenteur
+    return _done
+
+
+def _normalize_url(url: str) -> str:
+    """
+    Forme canonique pour la clé de cache : hôte en minuscules, paramètres
+    de tracking utm_* retirés, fragment ignoré
+    """
+    parsed = urlparse(url)
+    query = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+             if not k.lower().startswith('utm_')]
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(),
+                       parsed.path, parsed.params, urlencode(query), ''))
+
+_TRUSTED_DOMAINS = [
+    'bbc.com', 'reuters.com', 'ap.org', 'theguardian.com',
+    'lemonde.fr', 'france24.com', 'franceinfo.fr'
+]
+_SUSPICIOUS_DOMAINS = [
+    '.blogspot.', '.wordpress.', '.tumblr.', '.weebly.'
+]
+_DOMAIN_TYPES = [
+    ("institutionnel", ['.edu', '.gov', '.org']),
+    ("commercial", ['.com', '.net', '.io']),
+    ("média", ['.blog', '.news']),
+]
+
+# Un seul balayage du domaine pour toutes les listes au lieu d'un test
+# substring par entrée (même approche que le scanner de mots-clés du texte)
+if AHOCORASICK_AVAILABLE:
+    _DOMAIN_AC = ahocorasick.Automaton()
+    for _d in _TRUSTED_DOMAINS:
+        _DOMAIN_AC.add_word(_d, ("trusted", _d))
+    for _d in _SUSPICIOUS_DOMAINS:
+        _DOMAIN_AC.add_word(_d, ("suspicious", _d))
+    for _type, _suffixes in _DOMAIN_TYPES:
+        for _d in _suffixes:
+            _DOMAIN_AC.add_word(_d, (_type, _d))
+    _DOMAIN_AC.make_automaton()
+else:
+    _DOMAIN_AC = None
+
+
+@lru_cache(maxsize=256)
+def _scan_domain(domain: str) -> frozenset:
+    """
+    Classifie un domaine en un seul balayage ; les domaines repartagés
+    (quelques grands sites dominent le trafic) sortent du cache mémoïsé
+    """
+    if _DOMAIN_AC is not None:
+        return frozenset(cls for _, (cls, _) in _DOMAIN_AC.iter(domain))
+
+    classes = set()
+    if any(trusted in domain for trusted in _TRUSTED_DOMAINS):
+        classes.add("trusted")
+    if any(susp in domain for susp in _SUSPICIOUS_DOMAINS):
+        classes.add("suspicious")
+    for domain_type, suffixes in _DOMAIN_TYPES:
+        if any(x in domain for x in suffixes):
+            classes.add(domain_type)
+    return frozenset(classes)
+
 
 class URLAnalyzer:
+    # Session async partagée et liée à sa boucle d'événements, recréée avec
+    # elle (même logique que le client partagé de FactChecker)
+    _async_session = None
+    _async_session_loop = None
+
     def __init__(self):
         self.text_analyzer = TextAnalyzer()
         self.security_checker = URLSecurityChecker()
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': _USER_AGENT
         })
         logger.info("URLAnalyzer initialisé")
-    
-    def analyze(self, url: str) -> Dict:
+
+    @classmethod
+    def _get_async_session(cls):
+        loop = asyncio.get_running_loop()
+        if cls._async_session is None or cls._async_session_loop is not loop:
+            cls._async_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=aiohttp.TCPConnector(limit=20),
+                headers={'User-Agent': _USER_AGENT},
+            )
+            cls._async_session_loop = loop
+        return cls._async_session
+
+    async def analyze(self, url: str) -> Dict:
         """
         Analyse une URL pour extraire et vérifier le contenu
-        
+
+        L'extraction du contenu et les sondes de sécurité (TLS, DNS,
+        accessibilité) visent le même hôte mais sont indépendantes : elles
+        partent en parallèle, la latence totale vaut l'aller-retour le plus
+        lent au lieu de la somme des trois
+
         Args:
             url: L'URL à analyser
-            
+
         Returns:
             Dictionnaire avec les résultats de l'analyse
         """
@@ -34,36 +184,30 @@ class URLAnalyzer:
             parsed_url = urlparse(url)
             if not parsed_url.scheme or not parsed_url.netloc:
                 raise ValueError("URL invalide")
-            
-            content_data = self._extract_content(url)
-            
-            if content_data['text']:
-                text_analysis = self.text_analyzer.analyze(content_data['text'])
-            else:
-                text_analysis = {
-                    "type": "text",
-                    "input": "Contenu non extrait",
-                    "detection": {
-                        "verdict": "non_analysable",
-                        "confidence": 0.0,
-                        "is_fake": False,
-                        "reasons": ["Impossible d'extraire le contenu de l'URL"]
-                    }
-                }
-            
-            source_analysis = self._analyze_source(url, parsed_url)
-            security_check = self.security_checker.check_security(url)
-            
-            return {
-                "type": "url",
-                "url": url,
-                "source": source_analysis,
-                "security": security_check,
-                "content": content_data,
-                "analysis": text_analysis,
-                "recommendation": self._generate_url_recommendation(text_analysis, source_analysis, security_check)
-            }
-        
+
+            # exact_key : _normalize_url ne minuscule que schéma et hôte,
+            # chemin et query restent sensibles à la casse
+            cache_key = exact_key(_normalize_url(url), prefix="url")
+            cached = shared_cache.get(cache_key)
+            if cached is not None:
+                return dict(cached)
+
+            inflight = _get_inflight()
+            task = inflight.get(cache_key)
+            if task is None:
+                # L'analyse vit dans sa propre tâche, simplement attendue
+                # par chaque appelant : l'annulation d'un attenteur
+                # (déconnexion client) n'annule que son attente, pas le
+                # fetch partagé — sinon son CancelledError empoisonnerait
+                # tous les doublons
+                task = asyncio.get_running_loop().create_task(
+                    self._analyze_impl(url, parsed_url, cache_key)
+                )
+                inflight[cache_key] = task
+                task.add_done_callback(_discard_inflight(cache_key))
+            # Copie : chaque attenteur reçoit son propre dictionnaire
+            return dict(await asyncio.shield(task))
+
         except Exception as e:
             logger.error(f"Erreur lors de l'analyse de l'URL: {e}")
             return {
@@ -72,84 +216,152 @@ class URLAnalyzer:
                 "error": str(e),
                 "recommendation": "Impossible d'analyser cette URL. Vérifiez qu'elle est accessible et valide."
             }
-    
+
+    async def _analyze_impl(self, url: str, parsed_url, cache_key: str) -> Dict:
+        if AIOHTTP_AVAILABLE:
+            session = self._get_async_session()
+            content_data, security_check = await asyncio.gather(
+                self._extract_content_async(session, url),
+                self.security_checker.check_security_async(url, session),
+            )
+        else:
+            content_data = await asyncio.to_thread(self._extract_content, url)
+            security_check = await asyncio.to_thread(self.security_checker.check_security, url)
+
+        if content_data['text']:
+            text_analysis = await self.text_analyzer.analyze(content_data['text'])
+        else:
+            text_analysis = {
+                "type": "text",
+                "input": "Contenu non extrait",
+                "detection": {
+                    "verdict": "non_analysable",
+                    "confidence": 0.0,
+                    "is_fake": False,
+                    "reasons": ["Impossible d'extraire le contenu de l'URL"]
+                }
+            }
+
+        source_analysis = self._analyze_source(url, parsed_url)
+
+        result = {
+            "type": "url",
+            "url": url,
+            "source": source_analysis,
+            "security": security_check,
+            "content": content_data,
+            "analysis": text_analysis,
+            "recommendation": self._generate_url_recommendation(text_analysis, source_analysis, security_check)
+        }
+        # Les échecs d'extraction ne sont pas mis en cache : une page
+        # temporairement inaccessible mérite une nouvelle tentative
+        if content_data.get("extracted"):
+            shared_cache.set(cache_key, dict(result), ttl=_ANALYSIS_CACHE_TTL)
+        return result
+
     def _extract_content(self, url: str) -> Dict:
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            title = soup.find('title')
-            title_text = title.get_text() if title else ""
-            
-            for script in soup(["script", "style", "nav", "footer", "header"]):
-                script.decompose()
-            
-            paragraphs = soup.find_all(['p', 'article', 'div'])
-            text_content = " ".join([p.get_text() for p in paragraphs if p.get_text().strip()])
-            text_content = " ".join(text_content.split())
-            
-            if len(text_content) > 5000:
-                text_content = text_content[:5000] + "..."
-            
-            meta_description = soup.find('meta', attrs={'name': 'description'})
-            description = meta_description.get('content', '') if meta_description else ""
-            
-            return {
-                "title": title_text,
-                "text": text_content,
-                "description": description,
-                "length": len(text_content),
-                "extracted": True
-            }
-        
+            with self.session.get(url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                chunks = []
+                total = 0
+                for chunk in response.iter_content(_FETCH_CHUNK):
+                    chunks.append(chunk)
+                    total += len(chunk)
+                    if total >= _MAX_FETCH_BYTES:
+                        break
+            return self._parse_content(b''.join(chunks))
+
         except requests.exceptions.RequestException as e:
             logger.error(f"Erreur lors de l'extraction: {e}")
-            return {
-                "title": "",
-                "text": "",
-                "description": "",
-                "length": 0,
-                "extracted": False,
-                "error": str(e)
-            }
-    
+            return self._extraction_error(e)
+
+    async def _extract_content_async(self, session, url: str) -> Dict:
+        try:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                chunks = []
+                total = 0
+                async for chunk in response.content.iter_chunked(_FETCH_CHUNK):
+                    chunks.append(chunk)
+                    total += len(chunk)
+                    if total >= _MAX_FETCH_BYTES:
+                        break
+            return self._parse_content(b''.join(chunks))
+
+        except Exception as e:
+            logger.error(f"Erreur lors de l'extraction: {e}")
+            return self._extraction_error(e)
+
+    def _extraction_error(self, e: Exception) -> Dict:
+        return {
+            "title": "",
+            "text": "",
+            "description": "",
+            "length": 0,
+            "extracted": False,
+            "error": str(e)
+        }
+
+    def _parse_content(self, html) -> Dict:
+        soup = BeautifulSoup(html, _HTML_PARSER, parse_only=_CONTENT_STRAINER)
+
+        title = soup.find('title')
+        title_text = title.get_text() if title else ""
+
+        # Les <p> portent le texte utile ; <article> sert de repli quand la
+        # page n'en a pas. Troncature au fil de l'eau : on arrête de
+        # concaténer dès la limite atteinte au lieu de tout assembler
+        paragraphs = soup.find_all('p') or soup.find_all('article')
+        pieces = []
+        total = 0
+        for p in paragraphs:
+            chunk = " ".join(p.get_text().split())
+            if not chunk:
+                continue
+            pieces.append(chunk)
+            total += len(chunk) + 1
+            if total > _MAX_CONTENT_CHARS:
+                break
+
+        text_content = " ".join(pieces)
+        if len(text_content) > _MAX_CONTENT_CHARS:
+            text_content = text_content[:_MAX_CONTENT_CHARS] + "..."
+
+        meta_description = soup.find('meta', attrs={'name': 'description'})
+        description = meta_description.get('content', '') if meta_description else ""
+
+        return {
+            "title": title_text,
+            "text": text_content,
+            "description": description,
+            "length": len(text_content),
+            "extracted": True
+        }
+
     def _analyze_source(self, url: str, parsed_url) -> Dict:
         domain = parsed_url.netloc.lower()
-        
-        trusted_domains = [
-            'bbc.com', 'reuters.com', 'ap.org', 'theguardian.com',
-            'lemonde.fr', 'france24.com', 'franceinfo.fr'
-        ]
-        
-        suspicious_domains = [
-            '.blogspot.', '.wordpress.', '.tumblr.', '.weebly.'
-        ]
-        
-        is_trusted = any(trusted in domain for trusted in trusted_domains)
-        is_suspicious = any(susp in domain for susp in suspicious_domains)
-        
+        classes = _scan_domain(domain)
+
+        is_trusted = "trusted" in classes
+        is_suspicious = "suspicious" in classes
+
         domain_parts = domain.split('.')
         if len(domain_parts) > 3:
             is_suspicious = True
-        
+
         return {
             "domain": domain,
             "is_trusted": is_trusted,
             "is_suspicious": is_suspicious,
-            "domain_type": self._classify_domain(domain)
+            "domain_type": self._classify_domain(classes)
         }
-    
-    def _classify_domain(self, domain: str) -> str:
-        if any(x in domain for x in ['.edu', '.gov', '.org']):
-            return "institutionnel"
-        elif any(x in domain for x in ['.com', '.net', '.io']):
-            return "commercial"
-        elif any(x in domain for x in ['.blog', '.news']):
-            return "média"
-        else:
-            return "autre"
+
+    def _classify_domain(self, classes: set) -> str:
+        for domain_type, _ in _DOMAIN_TYPES:
+            if domain_type in classes:
+                return domain_type
+        return "autre"
     
     def _generate_url_recommendation(self, text_analysis: Dict, source_analysis: Dict, security_check: Dict = None) -> str:
         recommendations = []
@@ -1,15 +1,64 @@
+import asyncio
 import requests
 import ssl
 import socket
 import re
+import threading
+import time
 from urllib.parse import urlparse
 from typing import Dict, Optional
 import logging
 from datetime import datetime
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Domaines suspects connus
+_SUSPICIOUS_DOMAINS = [
+    '.tk', '.ml', '.ga', '.cf',  # Domaines gratuits souvent utilisés pour fraudes
+    '.xyz', '.top', '.click', '.download'  # Domaines souvent utilisés pour spam
+]
+
+# Domaines de confiance
+_TRUSTED_DOMAINS = [
+    'bbc.com', 'reuters.com', 'ap.org', 'theguardian.com',
+    'lemonde.fr', 'france24.com', 'franceinfo.fr', 'lefigaro.fr',
+    'nytimes.com', 'washingtonpost.com', 'cnn.com'
+]
+
+# TLD suspect : test d'appartenance O(1) sur le dernier segment du domaine,
+# plus précis qu'un test substring (".tk" au milieu d'un domaine légitime)
+_SUSPICIOUS_TLDS = frozenset(d.lstrip('.') for d in _SUSPICIOUS_DOMAINS)
+
+# Domaines de confiance en un seul balayage (même approche que les autres
+# scanners de mots-clés du projet)
+if AHOCORASICK_AVAILABLE:
+    _DOMAIN_AC = ahocorasick.Automaton()
+    for _d in _TRUSTED_DOMAINS:
+        _DOMAIN_AC.add_word(_d, ("trusted", _d))
+    _DOMAIN_AC.make_automaton()
+else:
+    _DOMAIN_AC = None
+
+# Alternation unique compilée à l'import : un seul passage du moteur regex
+# au lieu de deux recherches avec patterns en chaîne
+_TYPO_RE = re.compile(r'(?:[a-z]{2,}[-_][a-z]{2,})|(?:\d+[a-z]+\d+)')
+
+# Les sondes réseau (TLS ~100-300ms, DNS) sont mémorisées par domaine :
+# bbc.com/article/1 et /article/2 partagent la même poignée de main
+_DOMAIN_CHECK_TTL = 3600
+
+# Contexte TLS unique : create_default_context recharge le magasin de CA
+# (plusieurs ms) à chaque appel alors qu'il est immuable ici
+_SSL_CONTEXT = ssl.create_default_context()
+
 
 class URLSecurityChecker:
     def __init__(self):
@@ -18,18 +67,35 @@ class URLSecurityChecker:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         
-        # Domaines suspects connus
-        self.suspicious_domains = [
-            '.tk', '.ml', '.ga', '.cf',  # Domaines gratuits souvent utilisés pour fraudes
-            '.xyz', '.top', '.click', '.download'  # Domaines souvent utilisés pour spam
-        ]
-        
-        # Domaines de confiance
-        self.trusted_domains = [
-            'bbc.com', 'reuters.com', 'ap.org', 'theguardian.com',
-            'lemonde.fr', 'france24.com', 'franceinfo.fr', 'lefigaro.fr',
-            'nytimes.com', 'washingtonpost.com', 'cnn.com'
-        ]
+        self.suspicious_domains = _SUSPICIOUS_DOMAINS
+        self.trusted_domains = _TRUSTED_DOMAINS
+
+        self._domain_cache = {}
+        self._domain_cache_lock = threading.Lock()
+
+    def _cache_get(self, key) -> Optional[Dict]:
+        with self._domain_cache_lock:
+            entry = self._domain_cache.get(key)
+            if entry and time.monotonic() - entry[0] < _DOMAIN_CHECK_TTL:
+                return entry[1]
+            return None
+
+    def _cache_set(self, key, value: Dict) -> None:
+        with self._domain_cache_lock:
+            self._domain_cache[key] = (time.monotonic(), value)
+
+    def _refresh_ssl_validity(self, result: Dict) -> Dict:
+        # La validité est recalculée depuis la date d'expiration stockée :
+        # pas besoin de refaire la poignée de main pour un certificat connu
+        result = dict(result)
+        expires = result.get("expires")
+        if expires:
+            try:
+                not_after = datetime.strptime(expires, '%b %d %H:%M:%S %Y %Z')
+                result["valid"] = datetime.now() < not_after
+            except ValueError:
+                pass
+        return result
     
     def check_security(self, url: str) -> Dict:
         """
@@ -38,34 +104,45 @@ class URLSecurityChecker:
         try:
             parsed = urlparse(url)
             domain = parsed.netloc.lower()
-            
+
             ssl_check = self._check_ssl(domain, parsed.scheme == 'https')
             domain_check = self._check_domain(domain)
             reputation_check = self._check_reputation(domain)
             age_check = self._check_domain_age(domain)
-            
-            security_score = self._calculate_security_score(
-                ssl_check, domain_check, reputation_check, age_check
+
+            return self._build_security_result(
+                url, ssl_check, domain_check, reputation_check, age_check
             )
-            
-            is_secure = security_score >= 0.6
-            is_fraudulent = security_score < 0.4
-            
+
+        except Exception as e:
+            logger.error(f"Erreur vérification sécurité URL: {e}")
             return {
                 "url": url,
-                "domain": domain,
-                "is_secure": is_secure,
-                "is_fraudulent": is_fraudulent,
-                "security_score": float(security_score),
-                "ssl": ssl_check,
-                "domain": domain_check,
-                "reputation": reputation_check,
-                "age": age_check,
-                "recommendation": self._generate_security_recommendation(
-                    is_secure, is_fraudulent, security_score, ssl_check, domain_check
-                )
+                "error": str(e),
+                "is_secure": False,
+                "security_score": 0.0
             }
-        
+
+    async def check_security_async(self, url: str, session=None) -> Dict:
+        """
+        Variante asynchrone : la poignée de main TLS et la sonde de
+        réputation (DNS + GET) partent en parallèle
+        """
+        try:
+            parsed = urlparse(url)
+            domain = parsed.netloc.lower()
+
+            ssl_check, reputation_check = await asyncio.gather(
+                self._check_ssl_async(domain, parsed.scheme == 'https'),
+                self._check_reputation_async(domain, session),
+            )
+            domain_check = self._check_domain(domain)
+            age_check = self._check_domain_age(domain)
+
+            return self._build_security_result(
+                url, ssl_check, domain_check, reputation_check, age_check
+            )
+
         except Exception as e:
             logger.error(f"Erreur vérification sécurité URL: {e}")
             return {
@@ -74,6 +151,31 @@ class URLSecurityChecker:
                 "is_secure": False,
                 "security_score": 0.0
             }
+
+    def _build_security_result(self, url: str, ssl_check: Dict, domain_check: Dict,
+                               reputation_check: Dict, age_check: Dict) -> Dict:
+        domain = urlparse(url).netloc.lower()
+        security_score = self._calculate_security_score(
+            ssl_check, domain_check, reputation_check, age_check
+        )
+
+        is_secure = security_score >= 0.6
+        is_fraudulent = security_score < 0.4
+
+        return {
+            "url": url,
+            "domain": domain,
+            "is_secure": is_secure,
+            "is_fraudulent": is_fraudulent,
+            "security_score": float(security_score),
+            "ssl": ssl_check,
+            "domain": domain_check,
+            "reputation": reputation_check,
+            "age": age_check,
+            "recommendation": self._generate_security_recommendation(
+                is_secure, is_fraudulent, security_score, ssl_check, domain_check
+            )
+        }
     
     def _check_ssl(self, domain: str, is_https: bool) -> Dict:
         """
@@ -86,25 +188,16 @@ class URLSecurityChecker:
                 "error": "Pas de HTTPS"
             }
         
+        cached = self._cache_get(("ssl", domain))
+        if cached is not None:
+            return self._refresh_ssl_validity(cached)
+
         try:
-            context = ssl.create_default_context()
             with socket.create_connection((domain, 443), timeout=5) as sock:
-                with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                    cert = ssock.getpeercert()
-                    
-                    not_after = datetime.strptime(cert['notAfter'], '%b %d %H:%M:%S %Y %Z')
-                    is_valid = datetime.now() < not_after
-                    
-                    subject = dict(x[0] for x in cert['subject'])
-                    issuer = dict(x[0] for x in cert['issuer'])
-                    
-                    return {
-                        "has_ssl": True,
-                        "valid": is_valid,
-                        "expires": cert['notAfter'],
-                        "issuer": issuer.get('organizationName', 'Unknown'),
-                        "subject": subject.get('commonName', domain)
-                    }
+                with _SSL_CONTEXT.wrap_socket(sock, server_hostname=domain) as ssock:
+                    result = self._cert_summary(ssock.getpeercert(), domain)
+            self._cache_set(("ssl", domain), result)
+            return result
         except ssl.SSLError as e:
             return {
                 "has_ssl": True,
@@ -117,6 +210,67 @@ class URLSecurityChecker:
                 "valid": False,
                 "error": f"Impossible de vérifier SSL: {str(e)}"
             }
+
+    async def _check_ssl_async(self, domain: str, is_https: bool) -> Dict:
+        """
+        Poignée de main TLS sans bloquer la boucle : asyncio.open_connection
+        remplace le socket.create_connection bloquant
+        """
+        if not is_https:
+            return {
+                "has_ssl": False,
+                "valid": False,
+                "error": "Pas de HTTPS"
+            }
+
+        cached = self._cache_get(("ssl", domain))
+        if cached is not None:
+            return self._refresh_ssl_validity(cached)
+
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(domain, 443, ssl=_SSL_CONTEXT, server_hostname=domain),
+                timeout=5
+            )
+            try:
+                ssl_object = writer.get_extra_info('ssl_object')
+                cert = ssl_object.getpeercert()
+            finally:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except Exception:
+                    pass
+            result = self._cert_summary(cert, domain)
+            self._cache_set(("ssl", domain), result)
+            return result
+        except ssl.SSLError as e:
+            return {
+                "has_ssl": True,
+                "valid": False,
+                "error": f"Erreur SSL: {str(e)}"
+            }
+        except Exception as e:
+            return {
+                "has_ssl": False,
+                "valid": False,
+                "error": f"Impossible de vérifier SSL: {str(e)}"
+            }
+
+    def _cert_summary(self, cert: Dict, domain: str) -> Dict:
+        not_after = datetime.strptime(cert['notAfter'], '%b %d %H:%M:%S %Y %Z')
+        is_valid = datetime.now() < not_after
+
+        subject = dict(x[0] for x in cert['subject'])
+        issuer = dict(x[0] for x in cert['issuer'])
+
+        return {
+            "has_ssl": True,
+            "valid": is_valid,
+            "expires": cert['notAfter'],
+            "issuer": issuer.get('organizationName', 'Unknown'),
+            "subject": subject.get('commonName', domain)
+        }
     
     def _check_domain(self, domain: str) -> Dict:
         """
@@ -125,17 +279,23 @@ class URLSecurityChecker:
         is_suspicious = False
         is_trusted = False
         reasons = []
-        
-        for suspicious in self.suspicious_domains:
-            if suspicious in domain:
-                is_suspicious = True
-                reasons.append(f"Domaine suspect détecté: {suspicious}")
-        
-        for trusted in self.trusted_domains:
-            if trusted in domain:
-                is_trusted = True
-                reasons.append(f"Domaine de confiance: {trusted}")
-                break
+
+        tld = domain.rsplit('.', 1)[-1]
+        if tld in _SUSPICIOUS_TLDS:
+            is_suspicious = True
+            reasons.append(f"Domaine suspect détecté: .{tld}")
+
+        if _DOMAIN_AC is not None:
+            for _, (_cls, pattern) in _DOMAIN_AC.iter(domain):
+                if not is_trusted:
+                    is_trusted = True
+                    reasons.append(f"Domaine de confiance: {pattern}")
+        else:
+            for trusted in self.trusted_domains:
+                if trusted in domain:
+                    is_trusted = True
+                    reasons.append(f"Domaine de confiance: {trusted}")
+                    break
         
         if self._detect_typosquatting(domain):
             is_suspicious = True
@@ -152,39 +312,74 @@ class URLSecurityChecker:
         }
     
     def _detect_typosquatting(self, domain: str) -> bool:
-        suspicious_patterns = [
-            r'[a-z]{2,}[-_][a-z]{2,}',  # Domaines avec tirets multiples
-            r'\d+[a-z]+\d+',  # Mélange de chiffres et lettres suspect
-        ]
-        
-        for pattern in suspicious_patterns:
-            if re.search(pattern, domain):
-                return True
-        
-        return False
+        # Tirets multiples ou mélange chiffres/lettres suspect
+        return _TYPO_RE.search(domain) is not None
     
     def _check_reputation(self, domain: str) -> Dict:
+        cached = self._cache_get(("reputation", domain))
+        if cached is not None:
+            return dict(cached)
+
         checks = {
             "has_ip": False,
             "is_accessible": False
         }
-        
+
         try:
             ip = socket.gethostbyname(domain)
             checks["has_ip"] = True
             checks["ip"] = ip
-            
+
             try:
                 response = self.session.get(f"https://{domain}", timeout=5, allow_redirects=True)
                 checks["is_accessible"] = response.status_code == 200
             except:
                 pass
-                
+
         except Exception as e:
             logger.warning(f"Erreur vérification réputation: {e}")
-        
+
+        if checks["has_ip"]:
+            self._cache_set(("reputation", domain), dict(checks))
         return checks
-    
+
+    async def _check_reputation_async(self, domain: str, session=None) -> Dict:
+        cached = self._cache_get(("reputation", domain))
+        if cached is not None:
+            return dict(cached)
+
+        checks = {
+            "has_ip": False,
+            "is_accessible": False
+        }
+
+        try:
+            # Résolution DNS via la boucle (pool de threads interne) au lieu
+            # du gethostbyname bloquant
+            loop = asyncio.get_running_loop()
+            infos = await loop.getaddrinfo(domain, 443, type=socket.SOCK_STREAM)
+            checks["has_ip"] = True
+            checks["ip"] = infos[0][4][0]
+
+            try:
+                if session is not None:
+                    async with session.get(f"https://{domain}", allow_redirects=True) as response:
+                        checks["is_accessible"] = response.status == 200
+                else:
+                    response = await asyncio.to_thread(
+                        self.session.get, f"https://{domain}", timeout=5, allow_redirects=True
+                    )
+                    checks["is_accessible"] = response.status_code == 200
+            except Exception:
+                pass
+
+        except Exception as e:
+            logger.warning(f"Erreur vérification réputation: {e}")
+
+        if checks["has_ip"]:
+            self._cache_set(("reputation", domain), dict(checks))
+        return checks
+
     def _check_domain_age(self, domain: str) -> Dict:
         return {
             "age_verified": False,
@@ -1,6 +1,13 @@
 from typing import Dict, Any
 from datetime import datetime
 
+# Métadonnées statiques construites une seule fois à l'import : chaque
+# réponse partage le même dictionnaire au lieu d'en reconstruire un
+_METADATA = {
+    "version": "1.0.0",
+    "service": "TruthBot"
+}
+
 
 def format_response(result: Dict[str, Any], analysis_type: str) -> Dict[str, Any]:
     return {
@@ -8,9 +15,5 @@ def format_response(result: Dict[str, Any], analysis_type: str) -> Dict[str, Any
         "timestamp": datetime.now().isoformat(),
         "analysis_type": analysis_type,
         "result": result,
-        "metadata": {
-            "version": "1.0.0",
-            "service": "TruthBot"
-        }
+        "metadata": _METADATA
     }
-
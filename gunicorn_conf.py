@@ -0,0 +1,24 @@
+import os
+
+# Service multi-processus : un seul uvicorn sérialise l'inférence sur un
+# coeur malgré les pools de threads (le GIL reste tenu pendant les ops
+# tenseur). Lancement : gunicorn -c gunicorn_conf.py main:app
+workers = int(os.getenv("WEB_CONCURRENCY", 2 * (os.cpu_count() or 1) + 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = "0.0.0.0:%s" % os.getenv("PORT", "8000")
+
+# L'application s'importe dans le master et se fork : les pages du code et
+# des constantes de module sont partagées en copy-on-write entre workers
+# (les modèles eux-mêmes se chargent au lifespan, donc par worker)
+preload_app = True
+
+# Même choix que main.py : pas d'écriture stdout par requête
+accesslog = None
+
+
+def post_fork(server, worker):
+    # Un worker = un coeur : limiter les threads BLAS/torch par processus
+    # évite la sur-souscription quand tous les workers inférent en même
+    # temps (posé avant le chargement des modèles au lifespan)
+    os.environ.setdefault("OMP_NUM_THREADS", "1")
+    os.environ.setdefault("MKL_NUM_THREADS", "1")
@@ -1,67 +1,132 @@
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+
+# ORJSONResponse s'importe même sans orjson mais échoue au rendu : on teste
+# la présence du module lui-même
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse
+    _DEFAULT_RESPONSE_CLASS = ORJSONResponse
+except ImportError:
+    orjson = None
+    _DEFAULT_RESPONSE_CLASS = JSONResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
+from functools import wraps
 from jinja2 import Template
 from pathlib import Path
+from urllib.parse import urlsplit
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import uvicorn
 import os
 
 from app.services.text_analyzer import TextAnalyzer
 from app.services.url_analyzer import URLAnalyzer
-from app.services.image_analyzer import ImageAnalyzer
+from app.services.image_analyzer import ImageAnalyzer, analyze_image_bytes
 from app.utils.response_formatter import format_response
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    import asyncio
-    import logging
-    from concurrent.futures import ThreadPoolExecutor
-    
     logger = logging.getLogger(__name__)
     logger.info("Démarrage du serveur - chargement des modèles en arrière-plan...")
-    
+
+    # Pool borné pour le travail CPU : le threadpool par défaut de FastAPI
+    # (40 threads) laisserait trop d'inférences concurrentes se disputer
+    # les coeurs. Installé comme exécuteur par défaut pour que les
+    # asyncio.to_thread des analyseurs (inférence, base de faits) y passent
+    # aussi au lieu du pool illimité
+    app.state.cpu_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+    asyncio.get_running_loop().set_default_executor(app.state.cpu_pool)
+
+    def load_text_analyzer():
+        logger.info("Chargement de TextAnalyzer...")
+        get_text_analyzer()
+        logger.info("TextAnalyzer chargé")
+        # Passe de chauffe : la première vraie requête ne paie pas le
+        # chargement du tokenizer/modèle
+        get_text_analyzer().detector.detect_fake_news(
+            "Texte de chauffe pour précharger le modèle de détection."
+        )
+        _ready["text"] = True
+        logger.info("Modèle de détection préchauffé")
+
+    def load_url_analyzer():
+        logger.info("Chargement de URLAnalyzer...")
+        get_url_analyzer()
+        _ready["url"] = True
+        logger.info("URLAnalyzer chargé")
+
+    def load_image_analyzer():
+        logger.info("Chargement de ImageAnalyzer...")
+        get_image_analyzer()
+        _ready["image"] = True
+        logger.info("ImageAnalyzer chargé")
+
     def load_analyzers_sync():
-        try:
-            logger.info("Chargement de TextAnalyzer...")
-            get_text_analyzer()
-            logger.info("TextAnalyzer chargé")
-        except Exception as e:
-            logger.error(f"Erreur chargement TextAnalyzer: {e}")
-        
-        try:
-            logger.info("Chargement de URLAnalyzer...")
-            get_url_analyzer()
-            logger.info("URLAnalyzer chargé")
-        except Exception as e:
-            logger.error(f"Erreur chargement URLAnalyzer: {e}")
-        
-        try:
-            logger.info("Chargement de ImageAnalyzer...")
-            get_image_analyzer()
-            logger.info("ImageAnalyzer chargé")
-        except Exception as e:
-            logger.error(f"Erreur chargement ImageAnalyzer: {e}")
-        
+        # Chargements en parallèle : chaque analyseur lit ses poids sur
+        # disque indépendamment (I/O qui relâche le GIL), le démarrage
+        # coûte le plus lent des trois au lieu de leur somme. Pool
+        # transitoire pour ne pas consommer les workers du cpu_pool
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = {
+                pool.submit(load_text_analyzer): "TextAnalyzer",
+                pool.submit(load_url_analyzer): "URLAnalyzer",
+                pool.submit(load_image_analyzer): "ImageAnalyzer",
+            }
+            for future, name in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Erreur chargement {name}: {e}")
+
         logger.info("Tous les analyseurs sont prêts!")
-    
-    loop = asyncio.get_event_loop()
-    executor = ThreadPoolExecutor(max_workers=1)
-    loop.run_in_executor(executor, load_analyzers_sync)
-    
+
+    loop = asyncio.get_running_loop()
+    if os.getenv("WARM_MODELS") == "1":
+        # Mode workers chauds : le serveur n'accepte du trafic qu'une fois
+        # les trois analyseurs chargés — la première requête est aussi
+        # rapide que les suivantes
+        logger.info("WARM_MODELS=1 - chargement bloquant des analyseurs...")
+        await loop.run_in_executor(app.state.cpu_pool, load_analyzers_sync)
+    else:
+        loop.run_in_executor(app.state.cpu_pool, load_analyzers_sync)
+
     yield
-    
+
+    app.state.cpu_pool.shutdown(wait=False, cancel_futures=True)
     logger.info("Arrêt du serveur")
 
 
+# Sérialisation orjson (C) par défaut : les réponses imbriquées avec emojis
+# coûtent cher au module json standard sous charge.
+# DISABLE_DOCS=1 coupe Swagger/ReDoc et la génération du schéma OpenAPI en
+# production : le schéma parcourt toutes les routes au premier accès et ne
+# sert à rien derrière un load-balancer
+_docs_kwargs = {}
+if os.getenv("DISABLE_DOCS") == "1":
+    _docs_kwargs = {"docs_url": None, "redoc_url": None, "openapi_url": None}
+
 app = FastAPI(
     title="TruthBot",
     description="Détection de désinformation par IA - Défi AI4GOOD",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=_DEFAULT_RESPONSE_CLASS,
+    **_docs_kwargs
 )
 
+# Compression des réponses texte (HTML, JS, CSS, gros JSON d'analyse) :
+# ~5-10x moins d'octets sur le fil, le seuil évite de compresser les
+# petites réponses où l'en-tête gzip coûterait plus qu'il ne rapporte
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.mount("/static", StaticFiles(directory="static"), name="static")
 TEMPLATES_DIR = Path("templates")
 
@@ -69,6 +134,72 @@ text_analyzer = None
 url_analyzer = None
 image_analyzer = None
 
+# Disponibilité par analyseur : tant que le chargeur d'arrière-plan n'a pas
+# fini, les endpoints répondent 503 immédiatement au lieu de payer le
+# chargement complet du modèle dans la requête
+_ready = {"text": False, "url": False, "image": False}
+
+_ALLOWED_SCHEMES = frozenset({"http", "https"})
+
+# Limites de concurrence par endpoint : sans borne, une rafale empile les
+# inférences et la latence moyenne explose de façon super-linéaire (thrash
+# de contexte). L'image est la plus lourde, sa limite suit le pool de
+# processus ; au-delà du délai d'attente on déleste en 503 plutôt que de
+# laisser grossir la file
+_SLOT_LIMITS = {
+    "text": os.cpu_count() or 4,
+    "url": 8,
+    "image": max(1, (os.cpu_count() or 2) // 2),
+}
+_SLOT_TIMEOUT = 30
+_slots = {}
+
+
+@asynccontextmanager
+async def _analysis_slot(name: str):
+    sem = _slots.get(name)
+    if sem is None:
+        sem = _slots[name] = asyncio.Semaphore(_SLOT_LIMITS[name])
+    try:
+        await asyncio.wait_for(sem.acquire(), timeout=_SLOT_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=503,
+            detail="Service saturé, réessayez plus tard",
+            headers={"Retry-After": "10"},
+        )
+    try:
+        yield
+    finally:
+        sem.release()
+
+
+def analyzer_endpoint(fn):
+    """
+    Traduction except→HTTP commune aux endpoints d'analyse : les
+    HTTPException (400/413/503) passent telles quelles, tout le reste
+    devient un 500 journalisé une seule fois ici
+    """
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await fn(*args, **kwargs)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logging.getLogger(__name__).exception(f"Erreur lors de l'analyse: {e}")
+            raise HTTPException(status_code=500, detail=f"Erreur lors de l'analyse: {str(e)}")
+    return wrapper
+
+
+def _require_ready(name: str) -> None:
+    if not _ready[name]:
+        raise HTTPException(
+            status_code=503,
+            detail="Modèle en cours de chargement, réessayez dans quelques secondes",
+            headers={"Retry-After": "5"},
+        )
+
 def get_text_analyzer():
     global text_analyzer
     if text_analyzer is None:
@@ -87,70 +218,174 @@ def get_image_analyzer():
         image_analyzer = ImageAnalyzer()
     return image_analyzer
 
+# Pool de processus pour l'analyse d'image : NumPy/OpenCV/OCR sont des
+# charges CPU lourdes qui bloqueraient la boucle d'événements ; les workers
+# gardent leurs modèles résidents et le débit suit le nombre de coeurs
+_cpu_pool = None
+
+# Une analyse d'image ne dépasse jamais ce délai en fonctionnement normal :
+# au-delà, le worker est considéré coincé et la requête échoue en 504 au
+# lieu de retenir son créneau de concurrence pour toujours
+_IMAGE_TIMEOUT = 120
+
+def get_cpu_pool():
+    global _cpu_pool
+    if _cpu_pool is None:
+        # Contexte spawn plutôt que fork : au moment où ce pool se crée, le
+        # lifespan a déjà chargé le détecteur singleton et ses threads (pool
+        # d'heuristiques, micro-batcher) qui ne survivent pas à os.fork — un
+        # worker forké bloquerait indéfiniment sur ce pool mort. spawn
+        # réimporte les modules et chaque worker construit ses propres
+        # singletons
+        _cpu_pool = ProcessPoolExecutor(
+            max_workers=max(1, (os.cpu_count() or 2) // 2),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _cpu_pool
+
+
+# Lecture bornée des uploads : un fichier trop gros est rejeté dès que le
+# budget est dépassé, sans jamais le matérialiser entièrement en mémoire.
+# Le tampon reste en RAM (pas de SpooledTemporaryFile) : les octets doivent
+# de toute façon être sérialisés vers le worker du pool de processus, et le
+# plafond de 10 Mo borne déjà la mémoire résidente par upload
+_MAX_IMAGE_BYTES = 10 * 1024 * 1024
+_UPLOAD_CHUNK = 65536
+
+# Signatures des formats d'image acceptés : rejet immédiat des fichiers qui
+# ont trompé le test content_type sans payer l'ouverture PIL dans un worker
+_IMAGE_MAGIC = (
+    b'\xff\xd8\xff',        # JPEG
+    b'\x89PNG\r\n\x1a\n',   # PNG
+    b'GIF87a',              # GIF
+    b'GIF89a',
+    b'BM',                  # BMP
+    b'RIFF',                # WebP (RIFF....WEBP)
+    b'II*\x00',             # TIFF little-endian
+    b'MM\x00*',             # TIFF big-endian
+)
+
+
+async def _read_image_upload(file: UploadFile) -> bytes:
+    buf = bytearray()
+    while chunk := await file.read(_UPLOAD_CHUNK):
+        buf.extend(chunk)
+        if len(buf) > _MAX_IMAGE_BYTES:
+            raise HTTPException(status_code=413, detail="Image trop grande (maximum 10 Mo)")
+    if not buf.startswith(_IMAGE_MAGIC):
+        raise HTTPException(status_code=400, detail="Le fichier n'est pas une image valide")
+    return bytes(buf)
+
+
+
+# La page d'accueil se rend sans contexte : le HTML final est identique à
+# chaque requête, on le pré-rend une fois au premier accès au lieu de
+# recompiler et re-rendre le template Jinja2. L'ETag fort permet aux
+# clients de revalider en 304 sans retransfert du corps
+_index_page = None
+
+def get_index_page():
+    global _index_page
+    if _index_page is None:
+        template_path = TEMPLATES_DIR / "index.html"
+        with open(template_path, "r", encoding="utf-8") as f:
+            body = Template(f.read()).render().encode("utf-8")
+        etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+        _index_page = (body, etag)
+    return _index_page
 
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
-    template_path = TEMPLATES_DIR / "index.html"
-    with open(template_path, "r", encoding="utf-8") as f:
-        template = Template(f.read())
-    return HTMLResponse(content=template.render())
+    body, etag = get_index_page()
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=body, headers=headers)
 
 
 @app.post("/api/analyze/text")
+@analyzer_endpoint
 async def analyze_text(text: str = Form(...)):
-    try:
-        if not text or len(text.strip()) < 10:
-            raise HTTPException(status_code=400, detail="Le texte doit contenir au moins 10 caractères")
-        
-        analyzer = get_text_analyzer()
-        result = analyzer.analyze(text)
-        return format_response(result, "text")
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erreur lors de l'analyse: {str(e)}")
+    if not text or len(text.strip()) < 10:
+        raise HTTPException(status_code=400, detail="Le texte doit contenir au moins 10 caractères")
+
+    _require_ready("text")
+    analyzer = get_text_analyzer()
+    async with _analysis_slot("text"):
+        result = await analyzer.analyze(text)
+    return format_response(result, "text")
 
 
 @app.post("/api/analyze/url")
+@analyzer_endpoint
 async def analyze_url(url: str = Form(...)):
+    # urlsplit (implémenté en C) rejette les entrées malformées avant de
+    # réserver un analyseur : un scan hostile n'occupe jamais de worker
     try:
-        if not url or not url.startswith(('http://', 'https://')):
-            raise HTTPException(status_code=400, detail="URL invalide")
-        
-        analyzer = get_url_analyzer()
-        result = analyzer.analyze(url)
-        return format_response(result, "url")
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erreur lors de l'analyse: {str(e)}")
+        parts = urlsplit(url) if url else None
+    except ValueError:
+        parts = None
+    if parts is None or parts.scheme not in _ALLOWED_SCHEMES or not parts.netloc:
+        raise HTTPException(status_code=400, detail="URL invalide")
+
+    _require_ready("url")
+    analyzer = get_url_analyzer()
+    async with _analysis_slot("url"):
+        result = await analyzer.analyze(url)
+    return format_response(result, "url")
 
 
 @app.post("/api/analyze/image")
+@analyzer_endpoint
 async def analyze_image(file: UploadFile = File(...)):
-    try:
-        if not file.content_type or not file.content_type.startswith('image/'):
-            raise HTTPException(status_code=400, detail="Le fichier doit être une image")
-        
-        image_data = await file.read()
-        analyzer = get_image_analyzer()
-        result = analyzer.analyze(image_data)
-        return format_response(result, "image")
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erreur lors de l'analyse: {str(e)}")
-
-
-@app.get("/api/health")
+    if not file.content_type or not file.content_type.startswith('image/'):
+        raise HTTPException(status_code=400, detail="Le fichier doit être une image")
+
+    _require_ready("image")
+    image_data = await _read_image_upload(file)
+    loop = asyncio.get_running_loop()
+    async with _analysis_slot("image"):
+        try:
+            result = await asyncio.wait_for(
+                loop.run_in_executor(get_cpu_pool(), analyze_image_bytes, image_data),
+                timeout=_IMAGE_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="L'analyse de l'image a dépassé le délai imparti")
+    return format_response(result, "image")
+
+
+# Réponses santé pré-sérialisées : les sondes de vivacité frappent cet
+# endpoint en continu, les octets JSON sont mis en cache par état de
+# disponibilité (au plus 8 variantes) au lieu d'être ré-encodés à chaque
+# sonde
+_health_cache = {}
+
+
+@app.get("/api/health", include_in_schema=False)
 async def health_check():
-    return {
-        "status": "healthy",
-        "service": "TruthBot",
-        "version": "1.0.0"
-    }
+    state = (_ready["text"], _ready["url"], _ready["image"])
+    body = _health_cache.get(state)
+    if body is None:
+        payload = {
+            "status": "healthy",
+            "service": "TruthBot",
+            "version": "1.0.0",
+            "analyzers": dict(_ready)
+        }
+        if orjson is not None:
+            body = orjson.dumps(payload)
+        else:
+            body = json.dumps(payload).encode("utf-8")
+        _health_cache[state] = body
+    return Response(content=body, media_type="application/json")
 
 
 if __name__ == "__main__":
-    import os
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # uvicorn sélectionne automatiquement uvloop et httptools (boucle et
+    # parseur HTTP en C) dès qu'ils sont installés ; l'access log écrit sur
+    # stdout à chaque requête et se désactive pour le chemin chaud
+    uvicorn.run(app, host="0.0.0.0", port=port, access_log=False)
 